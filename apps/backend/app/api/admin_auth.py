@@ -1,39 +1,79 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.manager_user import ManagerUser
-from app.schemas.admin import LoginIn
-from app.services.auth import create_access_token, hash_password, verify_password
+from app.schemas.admin import LoginIn, ManagerStatusIn
+from app.services.auth import (
+    create_access_token,
+    get_current_manager,
+    hash_password_async,
+    revoke_manager,
+    verify_and_update_password,
+)
+from app.services.login_throttle import attempts_by_ip, failures_by_email
 
 router = APIRouter(prefix="/api/admin/auth", tags=["admin-auth"])
 
 
 @router.post("/bootstrap")
-def bootstrap_admin(email: str, password: str, db: Session = Depends(get_db)):
-    if db.query(ManagerUser).count() > 0:
+async def bootstrap_admin(email: str, password: str, db: AsyncSession = Depends(get_async_db)):
+    if await db.scalar(select(func.count(ManagerUser.id))) > 0:
         raise HTTPException(status_code=400, detail="already initialized")
-    manager = ManagerUser(email=email, password_hash=hash_password(password), role="admin")
+    manager = ManagerUser(email=email, password_hash=await hash_password_async(password), role="admin")
     db.add(manager)
-    db.commit()
+    await db.commit()
     return {"ok": True}
 
 
 @router.post("/login")
-def login(payload: LoginIn, response: Response, db: Session = Depends(get_db)):
-    user = db.query(ManagerUser).filter(ManagerUser.email == payload.email, ManagerUser.active.is_(True)).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginIn, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    client_ip = request.client.host if request.client else "unknown"
+    email = payload.email.lower()
+    retry_after = max(attempts_by_ip.retry_after(client_ip), failures_by_email.retry_after(email))
+    if retry_after:
+        raise HTTPException(status_code=429, detail="too many login attempts", headers={"Retry-After": str(retry_after)})
+    attempts_by_ip.hit(client_ip)
+
+    user = await db.scalar(select(ManagerUser).where(ManagerUser.email == payload.email, ManagerUser.active.is_(True)))
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update_password(payload.password, user.password_hash)
+    if not verified:
+        failures_by_email.hit(email)
         raise HTTPException(status_code=401, detail="invalid credentials")
+    failures_by_email.reset(email)
+    if new_hash:
+        user.password_hash = new_hash
     token = create_access_token(str(user.id))
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     response.set_cookie("admin_token", token, httponly=True, samesite="lax")
     return {"ok": True}
 
 
 @router.post("/logout")
-def logout(response: Response):
+async def logout(response: Response):
     response.delete_cookie("admin_token")
     return {"ok": True}
+
+
+@router.patch("/managers/{manager_id}")
+async def set_manager_status(
+    manager_id: int,
+    payload: ManagerStatusIn,
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_manager),
+):
+    if current.role != "admin":
+        raise HTTPException(status_code=403, detail="forbidden")
+    manager = await db.get(ManagerUser, manager_id)
+    if not manager:
+        raise HTTPException(status_code=404, detail="not found")
+    manager.active = payload.active
+    await db.commit()
+    revoke_manager(manager_id)
+    return {"ok": True}
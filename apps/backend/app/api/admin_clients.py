@@ -1,37 +1,58 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.client import Client
-from app.models.request import Request
 from app.services.auth import get_current_manager
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.services.request_search import client_search_condition, normalize_query
 
 router = APIRouter(prefix="/api/admin/clients", tags=["admin-clients"])
 
 
 @router.get("")
-def list_clients(db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    rows = (
-        db.query(
-            Client.id,
-            Client.telegram_id,
-            Client.username,
-            Client.consent_accepted_at,
-            func.count(Request.id).label("requests_count"),
-        )
-        .outerjoin(Request, Request.client_id == Client.id)
-        .group_by(Client.id)
-        .order_by(Client.id.desc())
-        .all()
+async def list_clients(
+    q: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(get_current_manager),
+):
+    stmt = select(
+        Client.id,
+        Client.telegram_id,
+        Client.username,
+        Client.consent_accepted_at,
+        Client.requests_count,
+        Client.last_request_at,
+        Client.created_at,
     )
-    return [
-        {
-            "id": r.id,
-            "telegram_id": r.telegram_id,
-            "username": r.username,
-            "consent_accepted_at": r.consent_accepted_at,
-            "requests_count": r.requests_count,
-        }
-        for r in rows
-    ]
+    term = normalize_query(q) if q else ""
+    if term:
+        stmt = stmt.where(client_search_condition(term))
+    if cursor:
+        after_created_at, after_id, _rank = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                Client.created_at < after_created_at,
+                and_(Client.created_at == after_created_at, Client.id < after_id),
+            )
+        )
+    rows = (await db.execute(stmt.order_by(Client.created_at.desc(), Client.id.desc()).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [
+            {
+                "id": r.id,
+                "telegram_id": r.telegram_id,
+                "username": r.username,
+                "consent_accepted_at": r.consent_accepted_at,
+                "requests_count": r.requests_count,
+                "last_request_at": r.last_request_at,
+            }
+            for r in rows
+        ],
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+    }
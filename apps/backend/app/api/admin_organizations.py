@@ -1,80 +1,92 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.client import Client
 from app.models.organization import Organization
-from app.schemas.admin import OrganizationIn
+from app.models.request import Request
+from app.schemas.admin import OrganizationIn, OrganizationOut
 from app.services.auth import get_current_manager
+from app.services.invoice_cache import invalidate_invoices
 
 router = APIRouter(prefix="/api/admin/organizations", tags=["admin-organizations"])
 
 
-@router.get("")
-def list_organizations(db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    rows = (
-        db.query(Organization, Client)
+async def _invalidate_client_invoices(db: AsyncSession, client_ids: set[int]) -> None:
+    request_ids = (await db.scalars(select(Request.id).where(Request.client_id.in_(client_ids)))).all()
+    await run_in_threadpool(invalidate_invoices, request_ids)
+
+
+@router.get("", response_model=list[OrganizationOut])
+async def list_organizations(db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    result = await db.execute(
+        select(
+            Organization.id,
+            Organization.client_id,
+            Client.username.label("contact_person"),
+            Organization.name,
+            Organization.inn,
+            Organization.kpp,
+            Organization.ogrn,
+            Organization.address,
+            Organization.settlement_account,
+            Organization.bik,
+            Organization.correspondent_account,
+            Organization.bank,
+            Organization.director,
+            Organization.contract,
+        )
         .join(Client, Client.id == Organization.client_id)
         .order_by(Organization.id.asc())
-        .all()
     )
-    return [
-        {
-            "id": org.id,
-            "client_id": org.client_id,
-            "contact_person": client.username,
-            "name": org.name,
-            "inn": org.inn,
-            "kpp": org.kpp,
-            "ogrn": org.ogrn,
-            "address": org.address,
-            "settlement_account": org.settlement_account,
-            "bik": org.bik,
-            "correspondent_account": org.correspondent_account,
-            "bank": org.bank,
-            "director": org.director,
-            "contract": org.contract,
-        }
-        for org, client in rows
-    ]
+    return ORJSONResponse([dict(row) for row in result.mappings()])
 
 
 @router.post("")
-def create_organization(payload: OrganizationIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    client = db.query(Client).filter(Client.id == payload.client_id).first()
+async def create_organization(payload: OrganizationIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    client = await db.get(Client, payload.client_id)
     if not client:
         raise HTTPException(status_code=400, detail="invalid client_id")
-    exists = db.query(Organization).filter(Organization.client_id == payload.client_id).first()
+    exists = await db.scalar(select(Organization).where(Organization.client_id == payload.client_id))
     if exists:
         raise HTTPException(status_code=400, detail="organization for client already exists")
 
     row = Organization(**payload.model_dump())
     db.add(row)
-    db.commit()
-    db.refresh(row)
+    await db.commit()
+    await db.refresh(row)
     return {"id": row.id}
 
 
 @router.patch("/{org_id}")
-def patch_organization(org_id: int, payload: OrganizationIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    row = db.query(Organization).filter(Organization.id == org_id).first()
+async def patch_organization(org_id: int, payload: OrganizationIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    row = await db.get(Organization, org_id)
     if not row:
         raise HTTPException(status_code=404, detail="not found")
     if payload.client_id != row.client_id:
-        duplicate = db.query(Organization).filter(Organization.client_id == payload.client_id, Organization.id != org_id).first()
+        duplicate = await db.scalar(
+            select(Organization).where(Organization.client_id == payload.client_id, Organization.id != org_id)
+        )
         if duplicate:
             raise HTTPException(status_code=400, detail="organization for client already exists")
+    affected_clients = {row.client_id, payload.client_id}
     for key, value in payload.model_dump().items():
         setattr(row, key, value)
-    db.commit()
+    await db.commit()
+    await _invalidate_client_invoices(db, affected_clients)
     return {"ok": True}
 
 
 @router.delete("/{org_id}")
-def delete_organization(org_id: int, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    row = db.query(Organization).filter(Organization.id == org_id).first()
+async def delete_organization(org_id: int, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    row = await db.get(Organization, org_id)
     if not row:
         raise HTTPException(status_code=404, detail="not found")
-    db.delete(row)
-    db.commit()
+    client_id = row.client_id
+    await db.delete(row)
+    await db.commit()
+    await _invalidate_client_invoices(db, {client_id})
     return {"ok": True}
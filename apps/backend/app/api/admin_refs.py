@@ -1,83 +1,97 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.delivery_slot import DeliverySlot
 from app.models.direction import Direction
 from app.schemas.admin import DeliverySlotIn, DirectionIn
 from app.services.auth import get_current_manager
+from app.services.reference_cache import bump_reference_version
 
 router = APIRouter(prefix="/api/admin", tags=["admin-refs"])
 
 
 @router.get("/directions")
-def list_directions(db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    rows = db.query(Direction).order_by(Direction.id.desc()).all()
+async def list_directions(db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    rows = (await db.scalars(select(Direction).order_by(Direction.id.desc()))).all()
     return [{"id": d.id, "name": d.name} for d in rows]
 
 
 @router.post("/directions")
-def create_direction(payload: DirectionIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
+async def create_direction(payload: DirectionIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
     row = Direction(name=payload.name)
     db.add(row)
-    db.commit()
-    db.refresh(row)
+    await db.commit()
+    bump_reference_version("directions")
+    await db.refresh(row)
     return {"id": row.id}
 
 
 @router.patch("/directions/{direction_id}")
-def patch_direction(direction_id: int, payload: DirectionIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    row = db.query(Direction).filter(Direction.id == direction_id).first()
+async def patch_direction(direction_id: int, payload: DirectionIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    row = await db.get(Direction, direction_id)
     if not row:
         raise HTTPException(status_code=404, detail="not found")
     row.name = payload.name
-    db.commit()
+    await db.commit()
+    bump_reference_version("directions")
     return {"ok": True}
 
 
 @router.get("/delivery-slots")
-def list_slots(db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    rows = db.query(DeliverySlot).order_by(DeliverySlot.date.desc()).all()
+async def list_slots(db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    rows = (await db.scalars(select(DeliverySlot).order_by(DeliverySlot.date.desc()))).all()
     return [
         {
             "id": s.id,
             "direction_id": s.direction_id,
             "date": str(s.date),
+            "capacity": s.capacity,
+            "reserved_boxes": s.reserved_boxes,
+            "reserved_weight_kg": float(s.reserved_weight_kg),
+            "reserved_volume_m3": float(s.reserved_volume_m3),
         }
         for s in rows
     ]
 
 
 @router.post("/delivery-slots")
-def create_slot(payload: DeliverySlotIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
+async def create_slot(payload: DeliverySlotIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
     slot = DeliverySlot(
         direction_id=payload.direction_id,
         date=datetime.strptime(payload.date, "%Y-%m-%d").date(),
+        capacity=payload.capacity,
     )
     db.add(slot)
-    db.commit()
-    db.refresh(slot)
+    await db.commit()
+    bump_reference_version("slots")
+    await db.refresh(slot)
     return {"id": slot.id}
 
 
 @router.patch("/delivery-slots/{slot_id}")
-def patch_slot(slot_id: int, payload: DeliverySlotIn, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    slot = db.query(DeliverySlot).filter(DeliverySlot.id == slot_id).first()
+async def patch_slot(slot_id: int, payload: DeliverySlotIn, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    slot = await db.get(DeliverySlot, slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="not found")
     slot.direction_id = payload.direction_id
     slot.date = datetime.strptime(payload.date, "%Y-%m-%d").date()
-    db.commit()
+    if "capacity" in payload.model_fields_set:
+        slot.capacity = payload.capacity
+    await db.commit()
+    bump_reference_version("slots")
     return {"ok": True}
 
 
 @router.delete("/delivery-slots/{slot_id}")
-def delete_slot(slot_id: int, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    slot = db.query(DeliverySlot).filter(DeliverySlot.id == slot_id).first()
+async def delete_slot(slot_id: int, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    slot = await db.get(DeliverySlot, slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="not found")
-    db.delete(slot)
-    db.commit()
+    await db.delete(slot)
+    await db.commit()
+    bump_reference_version("slots")
     return {"ok": True}
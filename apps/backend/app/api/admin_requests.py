@@ -1,69 +1,230 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy import String, cast
-from sqlalchemy.orm import Session
+import csv
+import io
+from datetime import datetime
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Float, and_, cast, func, insert, literal, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.client import Client
 from app.models.delivery_slot import DeliverySlot
 from app.models.direction import Direction
 from app.models.organization import Organization
 from app.models.request import Request, RequestStatus
 from app.models.request_history import RequestHistory
-from app.schemas.admin import RequestUpdateIn
+from app.schemas.admin import BulkStatusIn, InvoiceBatchIn, RequestPage, RequestUpdateIn
 from app.services.auth import get_current_manager
-from app.services.invoice_pdf import build_request_invoice_pdf
-from app.services.telegram import send_telegram_message
+from app.services.invoice_batch import iter_invoice_zip, snapshot
+from app.services.invoice_cache import get_cached_invoice, invalidate_invoices, invoice_key, store_invoice
+from app.services.invoice_pdf import build_request_invoice_pdf, invoice_inputs
+from app.services.notifications import notify
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.services.reference_cache import bump_reference_version
+from app.services.request_search import normalize_query, search_condition, search_rank
+from app.services.request_stats import move_request, move_status, stats_key
+from app.services.slot_capacity import move_reservation, normalize_amount, slot_load
 
 router = APIRouter(prefix="/api/admin/requests", tags=["admin-requests"])
 
+EXPORT_BATCH_SIZE = 1000
+STATUS_TRANSITIONS = {
+    RequestStatus.NEW: {RequestStatus.WAREHOUSE},
+    RequestStatus.WAREHOUSE: {RequestStatus.SHIPPED},
+    RequestStatus.SHIPPED: {RequestStatus.DELIVERED},
+    RequestStatus.DELIVERED: {RequestStatus.PAID},
+    RequestStatus.PAID: set(),
+    RequestStatus.OPEN: {RequestStatus.IN_PROGRESS, RequestStatus.WAREHOUSE},
+    RequestStatus.IN_PROGRESS: {RequestStatus.OPEN, RequestStatus.DONE, RequestStatus.SHIPPED},
+    RequestStatus.DONE: {RequestStatus.PAID},
+}
+EXPORT_COLUMNS = [
+    "Номер",
+    "Дата создания",
+    "Telegram ID",
+    "Username",
+    "Организация",
+    "ИНН",
+    "Направление",
+    "Дата доставки",
+    "Коробов",
+    "Объем (м3)",
+    "Вес (кг)",
+    "Статус",
+    "Комментарий",
+]
+
+
+def _apply_filters(query, status: RequestStatus | None, direction_id: int | None, term: str):
+    if status:
+        query = query.filter(Request.status == status)
+    if direction_id:
+        query = query.filter(Request.direction_id == direction_id)
+    if term:
+        query = query.filter(search_condition(term))
+    return query
+
+
+async def _estimate_total(db: AsyncSession, stmt, filtered: bool) -> int:
+    if not filtered and db.bind.dialect.name == "postgresql":
+        estimate = (await db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'requests'"))).scalar()
+        if estimate and estimate > 0:
+            return int(estimate)
+    return (await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))).scalar_one()
+
 
-@router.get("")
-def list_requests(
+@router.get("", response_model=RequestPage)
+async def list_requests(
     status: RequestStatus | None = None,
     direction_id: int | None = None,
     q: str | None = None,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    with_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     _=Depends(get_current_manager),
 ):
-    query = (
-        db.query(Request, Client, Direction, DeliverySlot, Organization)
+    term = normalize_query(q) if q else ""
+    rank = search_rank(term) if term else literal(0)
+    stmt = (
+        select(
+            Request.id,
+            Request.request_number,
+            Request.created_at,
+            Client.telegram_id,
+            Client.username,
+            Organization.name.label("organization"),
+            Direction.name.label("direction"),
+            DeliverySlot.date.label("delivery_date"),
+            Request.boxes_count,
+            cast(Request.volume_m3, Float).label("volume_m3"),
+            cast(Request.weight_kg, Float).label("weight_kg"),
+            Request.status,
+            rank.label("rank"),
+        )
         .join(Client, Client.id == Request.client_id)
         .outerjoin(Organization, Organization.client_id == Client.id)
         .join(Direction, Direction.id == Request.direction_id)
         .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
     )
-    if status:
-        query = query.filter(Request.status == status)
-    if direction_id:
-        query = query.filter(Request.direction_id == direction_id)
-    if q:
-        query = query.filter((Client.username.ilike(f"%{q}%")) | (cast(Client.telegram_id, String).ilike(f"%{q}%")))
-    rows = query.order_by(Request.created_at.desc()).all()
+    stmt = _apply_filters(stmt, status, direction_id, term)
+    total = await _estimate_total(db, stmt, bool(status or direction_id or term)) if with_total else None
+
+    page = stmt
+    if cursor:
+        after_created_at, after_id, after_rank = decode_cursor(cursor)
+        after_key = or_(
+            Request.created_at < after_created_at,
+            and_(Request.created_at == after_created_at, Request.id < after_id),
+        )
+        if term and after_rank is not None:
+            after_key = or_(rank < after_rank, and_(rank == after_rank, after_key))
+        page = page.filter(after_key)
+    order = [Request.created_at.desc(), Request.id.desc()]
+    if term:
+        order.insert(0, rank.desc())
+    items = [dict(row) for row in (await db.execute(page.order_by(*order).limit(limit + 1))).mappings()]
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"], last["rank"] if term else None)
+    for item in items:
+        del item["rank"]
+
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor, "total": total})
+
 
+async def _export_rows(status: RequestStatus | None, direction_id: int | None, term: str):
+    stmt = (
+        select(
+            Request.request_number,
+            Request.created_at,
+            Client.telegram_id,
+            Client.username,
+            Organization.name,
+            Organization.inn,
+            Direction.name,
+            DeliverySlot.date,
+            Request.boxes_count,
+            Request.volume_m3,
+            Request.weight_kg,
+            Request.status,
+            Request.comment,
+        )
+        .join(Client, Client.id == Request.client_id)
+        .outerjoin(Organization, Organization.client_id == Client.id)
+        .join(Direction, Direction.id == Request.direction_id)
+        .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
+    )
+    stmt = _apply_filters(stmt, status, direction_id, term)
+    stmt = stmt.order_by(Request.created_at.desc(), Request.id.desc())
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
+
+def _csv_row(row) -> list:
+    number, created_at, telegram_id, username, org_name, inn, direction, delivery_date, boxes, volume, weight, status, comment = row
     return [
-        {
-            "id": req.id,
-            "request_number": req.request_number,
-            "telegram_id": client.telegram_id,
-            "username": client.username,
-            "organization": org.name if org else None,
-            "direction": direction.name,
-            "delivery_date": str(slot.date),
-            "boxes_count": req.boxes_count,
-            "volume_m3": float(req.volume_m3),
-            "weight_kg": float(req.weight_kg),
-            "status": req.status.value,
-        }
-        for req, client, direction, slot, org in rows
+        number,
+        created_at.strftime("%Y-%m-%d %H:%M") if created_at else "",
+        telegram_id,
+        username or "",
+        org_name or "",
+        inn or "",
+        direction,
+        str(delivery_date),
+        boxes,
+        f"{float(volume):.2f}",
+        f"{float(weight):.2f}",
+        status.value,
+        comment or "",
     ]
 
 
+async def _iter_csv(status: RequestStatus | None, direction_id: int | None, term: str):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    async for partition in _export_rows(status, direction_id, term):
+        writer.writerows(_csv_row(row) for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get("/export.csv")
+async def export_requests_csv(
+    status: RequestStatus | None = None,
+    direction_id: int | None = None,
+    q: str | None = None,
+    _=Depends(get_current_manager),
+):
+    term = normalize_query(q) if q else ""
+    filename = f"requests-{datetime.now().strftime('%Y%m%d-%H%M')}.csv"
+    return StreamingResponse(
+        _iter_csv(status, direction_id, term),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{request_id}")
-def request_detail(request_id: int, db: Session = Depends(get_db), _=Depends(get_current_manager)):
-    req = db.query(Request).filter(Request.id == request_id).first()
+async def request_detail(request_id: int, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    req = await db.get(Request, request_id, options=[selectinload(Request.history)])
     if not req:
         raise HTTPException(status_code=404, detail="not found")
-    history = db.query(RequestHistory).filter(RequestHistory.request_id == request_id).order_by(RequestHistory.created_at.desc()).all()
     return {
         "id": req.id,
         "request_number": req.request_number,
@@ -82,73 +243,195 @@ def request_detail(request_id: int, db: Session = Depends(get_db), _=Depends(get
                 "comment": h.comment,
                 "created_at": h.created_at,
             }
-            for h in history
+            for h in req.history
         ],
     }
 
 
 @router.get("/{request_id}/invoice.pdf")
-def request_invoice_pdf(
+async def request_invoice_pdf(
     request_id: int,
-    db: Session = Depends(get_db),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
     _=Depends(get_current_manager),
 ):
     row = (
-        db.query(Request, Client, Direction, DeliverySlot, Organization)
-        .join(Client, Client.id == Request.client_id)
-        .join(Direction, Direction.id == Request.direction_id)
-        .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
-        .outerjoin(Organization, Organization.client_id == Client.id)
-        .filter(Request.id == request_id)
-        .first()
-    )
+        await db.execute(
+            select(Request, Client, Direction, DeliverySlot, Organization)
+            .join(Client, Client.id == Request.client_id)
+            .join(Direction, Direction.id == Request.direction_id)
+            .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
+            .outerjoin(Organization, Organization.client_id == Client.id)
+            .where(Request.id == request_id)
+        )
+    ).first()
     if not row:
         raise HTTPException(status_code=404, detail="not found")
 
     req, client, direction, slot, org = row
-    pdf_content = build_request_invoice_pdf(req, client, direction, slot, org)
+    key = invoice_key(invoice_inputs(req, client, direction, slot, org))
+    etag = f'"{key}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in [item.strip() for item in if_none_match.split(",")]:
+        return Response(status_code=304, headers=cache_headers)
+
+    pdf_content = await run_in_threadpool(get_cached_invoice, req.id, key)
+    if pdf_content is None:
+        pdf_content = await run_in_threadpool(build_request_invoice_pdf, req, client, direction, slot, org)
+        await run_in_threadpool(store_invoice, req.id, key, pdf_content)
     filename = f"invoice-request-{req.request_number}.pdf"
     return Response(
         content=pdf_content,
         media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **cache_headers},
+    )
+
+
+@router.post("/invoices.zip")
+async def batch_invoices_zip(
+    payload: InvoiceBatchIn,
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(get_current_manager),
+):
+    stmt = (
+        select(Request, Client, Direction, DeliverySlot, Organization)
+        .join(Client, Client.id == Request.client_id)
+        .join(Direction, Direction.id == Request.direction_id)
+        .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
+        .outerjoin(Organization, Organization.client_id == Client.id)
+    )
+    if payload.ids is not None:
+        stmt = stmt.where(Request.id.in_(payload.ids))
+    elif not (payload.status or payload.direction_id or payload.q):
+        raise HTTPException(status_code=400, detail="ids or filter required")
+    term = normalize_query(payload.q) if payload.q else ""
+    stmt = _apply_filters(stmt, payload.status, payload.direction_id, term)
+    rows = (await db.execute(stmt.order_by(Request.request_number).limit(settings.invoice_batch_limit + 1))).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="not found")
+    if len(rows) > settings.invoice_batch_limit:
+        raise HTTPException(status_code=400, detail="too many requests in batch")
+
+    jobs = [tuple(snapshot(item) for item in row) for row in rows]
+    filename = f"invoices-{datetime.now().strftime('%Y%m%d-%H%M')}.zip"
+    return StreamingResponse(
+        iter_invoice_zip(jobs),
+        media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+@router.post("/status")
+async def bulk_update_status(
+    payload: BulkStatusIn,
+    db: AsyncSession = Depends(get_async_db),
+    manager=Depends(get_current_manager),
+):
+    ids = sorted(set(payload.ids))
+    stmt = (
+        select(
+            Request.id,
+            Request.request_number,
+            Request.status,
+            Request.direction_id,
+            Request.delivery_slot_id,
+            Request.boxes_count,
+            Request.weight_kg,
+            Request.volume_m3,
+            Client.telegram_id,
+        )
+        .join(Client, Client.id == Request.client_id)
+        .where(Request.id.in_(ids))
+        .order_by(Request.id)
+        .with_for_update(of=Request)
+    )
+    rows = (await db.execute(stmt)).all()
+    missing = sorted(set(ids) - {row.id for row in rows})
+    if missing:
+        raise HTTPException(status_code=404, detail={"message": "not found", "ids": missing})
+    invalid = [row.id for row in rows if row.status != payload.status and payload.status not in STATUS_TRANSITIONS[row.status]]
+    if invalid:
+        raise HTTPException(status_code=400, detail={"message": "invalid status transition", "ids": invalid})
+
+    changed = [row for row in rows if row.status != payload.status]
+    if changed:
+        await db.execute(
+            update(Request)
+            .where(Request.id.in_([row.id for row in changed]))
+            .values(status=payload.status, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await move_status(
+            db,
+            [
+                (row.status.value, row.direction_id, row.delivery_slot_id, row.boxes_count, row.weight_kg, row.volume_m3)
+                for row in changed
+            ],
+            payload.status.value,
+        )
+        await db.execute(
+            insert(RequestHistory),
+            [
+                {
+                    "request_id": row.id,
+                    "event_type": "STATUS_CHANGED",
+                    "from_status": row.status.value,
+                    "to_status": payload.status.value,
+                    "changed_by_type": "manager",
+                    "changed_by_id": manager.id,
+                    "comment": payload.comment,
+                }
+                for row in changed
+            ],
+        )
+    await db.commit()
+
+    for row in changed:
+        notify(row.telegram_id, f"Заявка #{row.request_number}: статус изменен на {payload.status.value}")
+    return {"updated": [row.id for row in changed], "unchanged": [row.id for row in rows if row.status == payload.status]}
+
+
 @router.patch("/{request_id}")
 async def update_request(
     request_id: int,
     payload: RequestUpdateIn,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     manager=Depends(get_current_manager),
 ):
-    req = db.query(Request).filter(Request.id == request_id).first()
+    req = await db.get(
+        Request, request_id, options=[joinedload(Request.client)], with_for_update={"of": Request}
+    )
     if not req:
         raise HTTPException(status_code=404, detail="not found")
+    direction = payload.direction_id is None or await db.get(Direction, payload.direction_id)
+    slot = payload.delivery_slot_id is None or await db.get(DeliverySlot, payload.delivery_slot_id)
+    if not direction or not slot:
+        raise HTTPException(status_code=400, detail="invalid direction or slot")
 
     previous_status = req.status
-    for key in ["direction_id", "delivery_slot_id", "boxes_count", "weight_kg", "volume_m3"]:
+    previous_load = slot_load(req.delivery_slot_id, req.boxes_count, req.weight_kg, req.volume_m3)
+    previous_stats = stats_key(req)
+    for key in ["direction_id", "delivery_slot_id", "boxes_count"]:
         value = getattr(payload, key)
         if value is not None:
             setattr(req, key, value)
+    for key in ["weight_kg", "volume_m3"]:
+        value = getattr(payload, key)
+        if value is not None:
+            setattr(req, key, normalize_amount(value))
     if payload.comment is not None:
         req.comment = payload.comment
 
     if payload.status is not None:
-        allowed = {
-            RequestStatus.NEW: {RequestStatus.WAREHOUSE},
-            RequestStatus.WAREHOUSE: {RequestStatus.SHIPPED},
-            RequestStatus.SHIPPED: {RequestStatus.DELIVERED},
-            RequestStatus.DELIVERED: {RequestStatus.PAID},
-            RequestStatus.PAID: set(),
-            RequestStatus.OPEN: {RequestStatus.IN_PROGRESS, RequestStatus.WAREHOUSE},
-            RequestStatus.IN_PROGRESS: {RequestStatus.OPEN, RequestStatus.DONE, RequestStatus.SHIPPED},
-            RequestStatus.DONE: {RequestStatus.PAID},
-        }
-        if payload.status != req.status and payload.status not in allowed[req.status]:
+        if payload.status != req.status and payload.status not in STATUS_TRANSITIONS[req.status]:
             raise HTTPException(status_code=400, detail="invalid status transition")
         req.status = payload.status
 
+    load_changed = await move_reservation(
+        db, previous_load, slot_load(req.delivery_slot_id, req.boxes_count, req.weight_kg, req.volume_m3)
+    )
+    await move_request(db, previous_stats, stats_key(req))
+
     status_changed = previous_status != req.status
     db.add(
         RequestHistory(
@@ -161,10 +444,11 @@ async def update_request(
             comment=payload.comment,
         )
     )
-    db.commit()
+    await db.commit()
+    await run_in_threadpool(invalidate_invoices, [req.id])
+    if load_changed:
+        bump_reference_version("slots")
 
     if status_changed:
-        client = db.query(Client).filter(Client.id == req.client_id).first()
-        if client:
-            await send_telegram_message(client.telegram_id, f"Заявка #{req.request_number}: статус изменен на {req.status.value}")
+        notify(req.client.telegram_id, f"Заявка #{req.request_number}: статус изменен на {req.status.value}")
     return {"ok": True}
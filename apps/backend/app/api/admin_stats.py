@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.services.auth import get_current_manager
+from app.services.request_stats import load_dashboard
+
+router = APIRouter(prefix="/api/admin/stats", tags=["admin-stats"])
+
+
+@router.get("")
+async def dashboard(db: AsyncSession = Depends(get_async_db), _=Depends(get_current_manager)):
+    return await load_dashboard(db)
@@ -1,23 +1,28 @@
 from fastapi import Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.client import Client
-from app.services.telegram import validate_init_data
+from app.services.telegram import verify_init_data
+from app.services.webapp_auth import cache_client, get_cached_client
 
 
-def get_webapp_client(
+async def get_webapp_client(
     x_telegram_init_data: str = Header(default="", alias="X-Telegram-Init-Data"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Client:
     if not x_telegram_init_data:
         raise HTTPException(status_code=401, detail="missing initData")
+    client = get_cached_client(x_telegram_init_data)
+    if client is not None:
+        return client
     try:
-        tg_user = validate_init_data(x_telegram_init_data)
+        tg_user, expires_at = verify_init_data(x_telegram_init_data)
     except ValueError as exc:
         raise HTTPException(status_code=401, detail=str(exc)) from exc
 
-    client = db.query(Client).filter(Client.telegram_id == tg_user["id"]).first()
+    client = await db.scalar(select(Client).where(Client.telegram_id == tg_user["id"]))
     if not client:
         client = Client(
             telegram_id=tg_user["id"],
@@ -26,6 +31,8 @@ def get_webapp_client(
             last_name=tg_user.get("last_name"),
         )
         db.add(client)
-        db.commit()
-        db.refresh(client)
+        await db.commit()
+        await db.refresh(client)
+    db.expunge(client)
+    cache_client(x_telegram_init_data, client, expires_at)
     return client
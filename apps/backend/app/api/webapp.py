@@ -1,21 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from datetime import date
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Float, cast, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.api.deps import get_webapp_client
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.client import Client
 from app.models.delivery_slot import DeliverySlot
 from app.models.direction import Direction
 from app.models.request import Request
 from app.models.request_history import RequestHistory
-from app.schemas.webapp import RequestCreate
+from app.schemas.webapp import MyRequestItem, RequestCreate
+from app.services.reference_cache import bump_reference_version, cached_payload, derived_payload, payload_response
+from app.services.request_numbers import assign_request_number
+from app.services.request_stats import record_request
+from app.services.slot_capacity import remaining_boxes, reserve_slot
 
 router = APIRouter(prefix="/api/webapp", tags=["webapp"])
 
 
-@router.get("/me")
-def me(client: Client = Depends(get_webapp_client)):
+def _me(client: Client) -> dict:
     return {
         "telegram_id": client.telegram_id,
         "username": client.username,
@@ -23,67 +31,123 @@ def me(client: Client = Depends(get_webapp_client)):
     }
 
 
-@router.get("/directions")
-def list_directions(db: Session = Depends(get_db)):
-    rows = db.query(Direction).order_by(Direction.name).all()
+@router.get("/me")
+async def me(client: Client = Depends(get_webapp_client)):
+    return _me(client)
+
+
+async def _load_directions(db: AsyncSession) -> list[dict]:
+    rows = (await db.scalars(select(Direction).order_by(Direction.name))).all()
     return [{"id": r.id, "name": r.name} for r in rows]
 
 
-@router.get("/delivery-slots")
-def list_slots(direction_id: int | None = None, db: Session = Depends(get_db)):
-    q = db.query(DeliverySlot)
+async def _load_slots(db: AsyncSession, direction_id: int | None, include_past: bool = False) -> list[dict]:
+    q = select(DeliverySlot)
     if direction_id:
-        q = q.filter((DeliverySlot.direction_id == direction_id) | (DeliverySlot.direction_id.is_(None)))
-    rows = q.order_by(DeliverySlot.date).all()
+        q = q.where((DeliverySlot.direction_id == direction_id) | (DeliverySlot.direction_id.is_(None)))
+    if not include_past:
+        q = q.where(DeliverySlot.date >= date.today())
+    rows = (await db.scalars(q.order_by(DeliverySlot.date))).all()
     return [
         {
             "id": s.id,
             "direction_id": s.direction_id,
             "label": str(s.date),
+            "capacity": s.capacity,
+            "remaining": remaining_boxes(s),
         }
         for s in rows
     ]
 
 
-@router.get("/requests")
-def my_requests(client: Client = Depends(get_webapp_client), db: Session = Depends(get_db)):
-    rows = (
-        db.query(Request, Direction, DeliverySlot)
+@router.get("/directions")
+async def list_directions(
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    entry = await cached_payload("directions", lambda: _load_directions(db))
+    return payload_response(entry, if_none_match)
+
+
+@router.get("/delivery-slots")
+async def list_slots(
+    direction_id: int | None = None,
+    include_past: bool = False,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if include_past:
+        return await _load_slots(db, direction_id, include_past=True)
+    entry = await cached_payload("slots", lambda: _load_slots(db, None))
+    if direction_id:
+        entry = derived_payload(
+            entry, [slot for slot in entry.data if slot["direction_id"] in (direction_id, None)]
+        )
+    return payload_response(entry, if_none_match)
+
+
+async def _load_my_requests(db: AsyncSession, client: Client) -> list[dict]:
+    result = await db.execute(
+        select(
+            Request.id,
+            Request.request_number,
+            Direction.name.label("direction"),
+            DeliverySlot.date.label("delivery_date"),
+            Request.boxes_count,
+            cast(Request.weight_kg, Float).label("weight_kg"),
+            cast(Request.volume_m3, Float).label("volume_m3"),
+            literal(client.telegram_id).label("telegram_id"),
+            literal(client.username).label("username"),
+            Request.comment,
+            Request.status,
+            Request.created_at,
+        )
         .join(Direction, Direction.id == Request.direction_id)
         .join(DeliverySlot, DeliverySlot.id == Request.delivery_slot_id)
-        .filter(Request.client_id == client.id)
+        .where(Request.client_id == client.id)
         .order_by(Request.created_at.desc())
-        .all()
     )
-    return [
-        {
-            "id": req.id,
-            "request_number": req.request_number,
-            "direction": direction.name,
-            "delivery_date": str(slot.date),
-            "boxes_count": req.boxes_count,
-            "weight_kg": float(req.weight_kg),
-            "volume_m3": float(req.volume_m3),
-            "telegram_id": client.telegram_id,
-            "username": client.username,
-            "comment": req.comment,
-            "status": req.status.value,
-            "created_at": req.created_at,
-        }
-        for req, direction, slot in rows
-    ]
+    return [dict(row) for row in result.mappings()]
+
+
+@router.get("/bootstrap")
+async def bootstrap(client: Client = Depends(get_webapp_client), db: AsyncSession = Depends(get_async_db)):
+    directions = await cached_payload("directions", lambda: _load_directions(db))
+    slots = await cached_payload("slots", lambda: _load_slots(db, None))
+    requests = await _load_my_requests(db, client)
+    body = b"".join(
+        [
+            b'{"me":',
+            orjson.dumps(_me(client)),
+            b',"requests":',
+            orjson.dumps(requests),
+            b',"directions":',
+            directions.body,
+            b',"delivery_slots":',
+            slots.body,
+            b"}",
+        ]
+    )
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+
+
+@router.get("/requests", response_model=list[MyRequestItem])
+async def my_requests(client: Client = Depends(get_webapp_client), db: AsyncSession = Depends(get_async_db)):
+    return ORJSONResponse(await _load_my_requests(db, client))
 
 
 @router.post("/requests")
-def create_request(payload: RequestCreate, client: Client = Depends(get_webapp_client), db: Session = Depends(get_db)):
-    direction = db.query(Direction).filter(Direction.id == payload.direction_id).first()
-    slot = db.query(DeliverySlot).filter(DeliverySlot.id == payload.delivery_slot_id).first()
+async def create_request(
+    payload: RequestCreate,
+    client: Client = Depends(get_webapp_client),
+    db: AsyncSession = Depends(get_async_db),
+):
+    direction = await db.get(Direction, payload.direction_id)
+    slot = await db.get(DeliverySlot, payload.delivery_slot_id)
     if not direction or not slot:
         raise HTTPException(status_code=400, detail="invalid direction or slot")
 
-    next_number = (db.query(func.max(Request.request_number)).scalar() or 0) + 1
     req = Request(
-        request_number=next_number,
         client_id=client.id,
         direction_id=payload.direction_id,
         delivery_slot_id=payload.delivery_slot_id,
@@ -92,8 +156,11 @@ def create_request(payload: RequestCreate, client: Client = Depends(get_webapp_c
         volume_m3=payload.volume_m3,
         comment=payload.comment,
     )
+    await assign_request_number(db, req)
+    await reserve_slot(db, slot.id, payload.boxes_count, payload.weight_kg, payload.volume_m3)
     db.add(req)
-    db.flush()
+    await db.flush()
+    await record_request(db, req)
     db.add(
         RequestHistory(
             request_id=req.id,
@@ -103,24 +170,30 @@ def create_request(payload: RequestCreate, client: Client = Depends(get_webapp_c
             changed_by_id=client.id,
         )
     )
-    db.commit()
+    await db.commit()
+    bump_reference_version("slots")
     return {"id": req.id, "request_number": req.request_number, "status": req.status.value}
 
 
 @router.get("/requests/{request_id}")
-def request_detail(request_id: int, client: Client = Depends(get_webapp_client), db: Session = Depends(get_db)):
-    req = db.query(Request).filter(Request.id == request_id, Request.client_id == client.id).first()
+async def request_detail(
+    request_id: int,
+    client: Client = Depends(get_webapp_client),
+    db: AsyncSession = Depends(get_async_db),
+):
+    req = await db.scalar(
+        select(Request)
+        .options(joinedload(Request.direction), joinedload(Request.delivery_slot), selectinload(Request.history))
+        .where(Request.id == request_id, Request.client_id == client.id)
+    )
     if not req:
         raise HTTPException(status_code=404, detail="not found")
-    direction = db.query(Direction).filter(Direction.id == req.direction_id).first()
-    slot = db.query(DeliverySlot).filter(DeliverySlot.id == req.delivery_slot_id).first()
-    history = db.query(RequestHistory).filter(RequestHistory.request_id == req.id).order_by(RequestHistory.created_at.desc()).all()
 
     return {
         "id": req.id,
         "request_number": req.request_number,
-        "direction": direction.name if direction else None,
-        "delivery_slot": str(slot.date) if slot else None,
+        "direction": req.direction.name if req.direction else None,
+        "delivery_slot": str(req.delivery_slot.date) if req.delivery_slot else None,
         "boxes_count": req.boxes_count,
         "weight_kg": float(req.weight_kg),
         "volume_m3": float(req.volume_m3),
@@ -137,6 +210,6 @@ def request_detail(request_id: int, client: Client = Depends(get_webapp_client),
                 "comment": h.comment,
                 "created_at": h.created_at,
             }
-            for h in history
+            for h in req.history
         ],
     }
@@ -1,13 +1,18 @@
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.client import Client
+from app.services.notifications import notify
+from app.services.webapp_auth import forget_client
 
+CONSENT_TEXT = "Согласие на обработку персональных данных: нажмите 'Принимаю', чтобы продолжить."
 
-def apply_start(db: Session, tg_user: dict) -> Client:
-    client = db.query(Client).filter(Client.telegram_id == tg_user["id"]).first()
+
+async def apply_start(db: AsyncSession, tg_user: dict) -> Client:
+    client = await db.scalar(select(Client).where(Client.telegram_id == tg_user["id"]))
     if not client:
         client = Client(
             telegram_id=tg_user["id"],
@@ -16,15 +21,55 @@ def apply_start(db: Session, tg_user: dict) -> Client:
             last_name=tg_user.get("last_name"),
         )
         db.add(client)
-        db.commit()
-        db.refresh(client)
+        await db.commit()
+        await db.refresh(client)
     return client
 
 
-def apply_consent(db: Session, telegram_id: int) -> None:
-    client = db.query(Client).filter(Client.telegram_id == telegram_id).first()
+async def apply_consent(db: AsyncSession, telegram_id: int) -> None:
+    client = await db.scalar(select(Client).where(Client.telegram_id == telegram_id))
     if not client:
         return
     client.consent_accepted_at = datetime.utcnow()
     client.consent_version = settings.consent_version
-    db.commit()
+    await db.commit()
+    forget_client(telegram_id)
+
+
+async def handle_update(db: AsyncSession, payload: dict) -> None:
+    msg = payload.get("message", {})
+    text = msg.get("text", "")
+    user = msg.get("from")
+    callback = payload.get("callback_query")
+
+    if text == "/start" and user:
+        await apply_start(db, user)
+        notify(
+            msg.get("chat", {}).get("id"),
+            CONSENT_TEXT,
+            {
+                "inline_keyboard": [
+                    [{"text": "Принимаю", "callback_data": "consent_accept"}],
+                    [{"text": "Не принимаю", "callback_data": "consent_decline"}],
+                ]
+            },
+        )
+        return
+
+    if callback:
+        action = callback.get("data")
+        tg_id = callback.get("from", {}).get("id")
+        chat_id = callback.get("message", {}).get("chat", {}).get("id")
+        if action == "consent_accept" and tg_id:
+            await apply_consent(db, tg_id)
+            notify(
+                chat_id,
+                "Согласие принято. Откройте приложение.",
+                {
+                    "inline_keyboard": [
+                        [{"text": "Открыть приложение", "web_app": {"url": settings.webapp_url}}],
+                    ]
+                },
+            )
+        elif action == "consent_decline":
+            notify(chat_id, "Без согласия работа с сервисом невозможна.")
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+from app.bot.handlers import handle_update
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class RecentIds:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._ids: OrderedDict[int, None] = OrderedDict()
+
+    def __contains__(self, update_id: int) -> bool:
+        return update_id in self._ids
+
+    def add(self, update_id: int) -> None:
+        self._ids[update_id] = None
+        if len(self._ids) > self.size:
+            self._ids.popitem(last=False)
+
+
+def _sender_id(payload: dict) -> int:
+    for key in ("message", "edited_message", "callback_query"):
+        sender = (payload.get(key) or {}).get("from") or {}
+        if "id" in sender:
+            return int(sender["id"])
+    return int(payload.get("update_id") or 0)
+
+
+class UpdateProcessor:
+    def __init__(self) -> None:
+        self.queues: list[asyncio.Queue[dict]] = []
+        self.seen = RecentIds(settings.telegram_update_dedup_window)
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        workers = max(settings.telegram_update_workers, 1)
+        self.queues = [asyncio.Queue(maxsize=max(settings.telegram_update_queue_size // workers, 1)) for _ in range(workers)]
+        self._workers = [asyncio.create_task(self._worker(queue)) for queue in self.queues]
+
+    async def stop(self, timeout: float = 10) -> None:
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self.queues)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("dropping %s unprocessed telegram updates", sum(queue.qsize() for queue in self.queues))
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.queues = []
+
+    def submit(self, payload: dict) -> bool:
+        update_id = payload.get("update_id")
+        if update_id is not None and update_id in self.seen:
+            return True
+        if not self.running:
+            return False
+        try:
+            self.queues[_sender_id(payload) % len(self.queues)].put_nowait(payload)
+        except asyncio.QueueFull:
+            return False
+        if update_id is not None:
+            self.seen.add(update_id)
+        return True
+
+    async def _worker(self, queue: asyncio.Queue[dict]) -> None:
+        while True:
+            payload = await queue.get()
+            try:
+                async with AsyncSessionLocal() as db:
+                    await handle_update(db, payload)
+            except Exception:
+                logger.exception("telegram update %s failed", payload.get("update_id"))
+            finally:
+                queue.task_done()
+
+
+updates = UpdateProcessor()
@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,15 +7,62 @@ class Settings(BaseSettings):
     app_name: str = "mini-crm"
     environment: str = "dev"
     db_url: str = "postgresql+psycopg://postgres:postgres@db:5432/minicrm"
+    web_bind: str = "0.0.0.0:8000"
+    web_workers: int = 0
+    web_preload: bool = True
+    web_graceful_timeout: int = 30
+    web_keepalive: int = 5
+    web_max_requests: int = 0
     bot_token: str = ""
     telegram_webhook_secret: str = ""
     webapp_url: str = "http://localhost:3000/webapp"
     jwt_secret: str = "change-me"
     jwt_exp_minutes: int = 120
+    manager_cache_seconds: int = 5
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue: int = 16
+    login_max_attempts_per_ip: int = 20
+    login_max_failures_per_email: int = 5
+    login_window_seconds: int = 300
     consent_version: str = "v1"
     telegram_initdata_ttl_seconds: int = 3600
+    webapp_auth_cache_size: int = 10000
+    reference_cache_seconds: int = 60
+    webapp_client_cache_seconds: int = 300
+    notification_workers: int = 4
+    notification_queue_size: int = 10000
+    telegram_global_rate_per_second: float = 25
+    telegram_chat_interval_seconds: float = 1.0
+    notification_drain_seconds: float = 10
+    telegram_update_workers: int = 4
+    telegram_update_queue_size: int = 1000
+    telegram_update_dedup_window: int = 10000
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_max_connections: int = 100
+    invoice_workers: int = 0
+    invoice_batch_limit: int = 5000
+    invoice_cache_dir: str = "/tmp/invoice-cache"
+    invoice_cache_max_bytes: int = 256 * 1024 * 1024
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
 settings = Settings()
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def web_worker_count() -> int:
+    if settings.web_workers:
+        return settings.web_workers
+    per_worker = settings.db_pool_size + settings.db_max_overflow
+    return max(1, min(available_cpus(), settings.db_max_connections // per_worker))
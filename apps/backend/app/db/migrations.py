@@ -0,0 +1,183 @@
+import logging
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, Numeric, Sequence, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import schema_v1
+from app.services.request_stats import rebuild_client_counters, rebuild_request_stats
+from app.services.slot_capacity import recalculate_slot_totals
+
+logger = logging.getLogger(__name__)
+
+ADVISORY_LOCK_KEY = 7_310_019
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(128), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False, default=datetime.utcnow),
+)
+
+counters = Table(
+    "counters",
+    MetaData(),
+    Column("name", String(64), primary_key=True),
+    Column("value", BigInteger, nullable=False),
+)
+
+request_stats_table = Table(
+    "request_stats",
+    MetaData(),
+    Column("status", String(32), primary_key=True),
+    Column("direction_id", Integer, primary_key=True),
+    Column("delivery_slot_id", Integer, primary_key=True),
+    Column("requests_count", Integer, nullable=False, server_default="0"),
+    Column("boxes_count", Integer, nullable=False, server_default="0"),
+    Column("weight_kg", Numeric(14, 2), nullable=False, server_default="0"),
+    Column("volume_m3", Numeric(14, 2), nullable=False, server_default="0"),
+)
+
+INDEXES = [
+    "CREATE INDEX ix_clients_created_at_id ON clients (created_at, id)",
+    "CREATE INDEX ix_requests_status_direction_created ON requests (status, direction_id, created_at, id)",
+    "CREATE INDEX ix_requests_client_created ON requests (client_id, created_at)",
+    "CREATE INDEX ix_request_history_request_created ON request_history (request_id, created_at)",
+    "CREATE INDEX ix_delivery_slots_direction_date ON delivery_slots (direction_id, date)",
+]
+
+TRIGRAM_INDEXES = [
+    "CREATE INDEX ix_clients_username_trgm ON clients USING gin (username gin_trgm_ops)",
+    "CREATE INDEX ix_clients_telegram_id_trgm ON clients USING gin ((CAST(telegram_id AS TEXT)) gin_trgm_ops)",
+    "CREATE INDEX ix_organizations_name_trgm ON organizations USING gin (name gin_trgm_ops)",
+    "CREATE INDEX ix_organizations_inn_trgm ON organizations USING gin (inn gin_trgm_ops)",
+    "CREATE INDEX ix_requests_request_number_trgm ON requests USING gin ((CAST(request_number AS TEXT)) gin_trgm_ops)",
+]
+
+SEARCH_STATISTICS_TARGET = 1000
+SEARCH_COLUMNS = [("clients", "username"), ("organizations", "name"), ("organizations", "inn")]
+
+
+def baseline(conn: Connection) -> None:
+    schema_v1.metadata.create_all(bind=conn)
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE requests ADD COLUMN IF NOT EXISTS comment TEXT"))
+        conn.execute(text("ALTER TABLE directions DROP COLUMN IF EXISTS active"))
+        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS active"))
+        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS time_from"))
+        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS time_to"))
+        conn.execute(text("ALTER TABLE organizations ADD COLUMN IF NOT EXISTS contract TEXT"))
+        for value in ["NEW", "WAREHOUSE", "SHIPPED", "DELIVERED", "PAID"]:
+            conn.execute(text(f"ALTER TYPE requeststatus ADD VALUE IF NOT EXISTS '{value}'"))
+
+
+def request_number_sequence(conn: Connection) -> None:
+    counters.create(bind=conn)
+    if conn.dialect.name != "postgresql":
+        return
+    Sequence("request_number_seq").create(bind=conn)
+    conn.execute(
+        text(
+            "SELECT setval('request_number_seq', s.max_number) "
+            "FROM (SELECT MAX(request_number) AS max_number FROM requests) s, request_number_seq q "
+            "WHERE s.max_number >= CASE WHEN q.is_called THEN q.last_value + 1 ELSE q.last_value END"
+        )
+    )
+
+
+def slot_reservations(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE delivery_slots ADD COLUMN reserved_boxes INTEGER NOT NULL DEFAULT 0"))
+    conn.execute(text("ALTER TABLE delivery_slots ADD COLUMN reserved_weight_kg NUMERIC(12, 2) NOT NULL DEFAULT 0"))
+    conn.execute(text("ALTER TABLE delivery_slots ADD COLUMN reserved_volume_m3 NUMERIC(12, 2) NOT NULL DEFAULT 0"))
+    recalculate_slot_totals(conn)
+
+
+def request_stats(conn: Connection) -> None:
+    request_stats_table.create(bind=conn)
+    rebuild_request_stats(conn)
+
+
+def client_counters(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE clients ADD COLUMN requests_count INTEGER NOT NULL DEFAULT 0"))
+    timestamp = DateTime(timezone=True).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE clients ADD COLUMN last_request_at {timestamp}"))
+    rebuild_client_counters(conn)
+
+
+def query_indexes(conn: Connection) -> None:
+    for ddl in INDEXES:
+        conn.execute(text(ddl))
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for ddl in TRIGRAM_INDEXES:
+        conn.execute(text(ddl))
+
+
+def request_number_default(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("ALTER TABLE requests ALTER COLUMN request_number SET DEFAULT nextval('request_number_seq')"))
+
+
+def search_statistics(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    for table, column in SEARCH_COLUMNS:
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET STATISTICS {SEARCH_STATISTICS_TARGET}"))
+    for table in {table for table, _ in SEARCH_COLUMNS}:
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline", baseline),
+    (2, "request_number_sequence", request_number_sequence),
+    (3, "slot_reservations", slot_reservations),
+    (4, "request_stats", request_stats),
+    (5, "client_counters", client_counters),
+    (6, "query_indexes", query_indexes),
+    (7, "request_number_default", request_number_default),
+    (8, "search_statistics", search_statistics),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _lock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    with engine.begin() as conn:
+        _lock(conn)
+        schema_migrations.create(bind=conn, checkfirst=True)
+    for version, name, migrate in MIGRATIONS:
+        with engine.begin() as conn:
+            _lock(conn)
+            applied = conn.execute(
+                select(schema_migrations.c.version).where(schema_migrations.c.version == version)
+            ).first()
+            if applied:
+                continue
+            logger.info("applying migration %s_%s", version, name)
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(version=version, name=name))
+    return LATEST_VERSION
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.core.config import settings
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info("schema at version %s", run_migrations(create_engine(settings.db_url, poolclass=NullPool)))
@@ -0,0 +1,57 @@
+import os
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, generate_latest, multiprocess
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum")
+CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out", ["pool"], multiprocess_mode="livesum")
+OVERFLOW = Gauge("db_pool_overflow", "Overflow connections open", ["pool"], multiprocess_mode="livesum")
+CHECKOUTS = Counter("db_pool_checkouts", "Connection checkouts", ["pool"])
+TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that hit pool_timeout", ["pool"])
+WAIT_SECONDS = Counter("db_pool_wait_seconds", "Time spent waiting for a connection", ["pool"])
+WAIT_SECONDS_MAX = Gauge("db_pool_wait_seconds_max", "Longest checkout wait", ["pool"], multiprocess_mode="max")
+
+_wait_max: dict[str, float] = {}
+
+
+class _MeteredPoolMixin:
+    def _observe(self) -> None:
+        name = self._orig_logging_name
+        POOL_SIZE.labels(name).set(self.size())
+        CHECKED_OUT.labels(name).set(self.checkedout())
+        OVERFLOW.labels(name).set(max(self.overflow(), 0))
+
+    def connect(self):
+        name = self._orig_logging_name
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            TIMEOUTS.labels(name).inc()
+            raise
+        waited = time.perf_counter() - started
+        CHECKOUTS.labels(name).inc()
+        WAIT_SECONDS.labels(name).inc(waited)
+        if waited > _wait_max.get(name, 0.0):
+            _wait_max[name] = waited
+            WAIT_SECONDS_MAX.labels(name).set(waited)
+        self._observe()
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._observe()
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def render_pool_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
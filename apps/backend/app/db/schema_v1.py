@@ -0,0 +1,115 @@
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+)
+
+metadata = MetaData()
+
+manager_users = Table(
+    "manager_users",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("email", String(255), nullable=False, unique=True, index=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("role", String(32), nullable=False),
+    Column("active", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("last_login_at", DateTime(timezone=True)),
+)
+
+clients = Table(
+    "clients",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("telegram_id", BigInteger, nullable=False, unique=True, index=True),
+    Column("username", String(128), index=True),
+    Column("first_name", String(128)),
+    Column("last_name", String(128)),
+    Column("consent_version", String(32)),
+    Column("consent_accepted_at", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+organizations = Table(
+    "organizations",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("client_id", Integer, ForeignKey("clients.id"), nullable=False, unique=True, index=True),
+    Column("name", String(255), nullable=False, index=True),
+    Column("inn", String(32)),
+    Column("kpp", String(32)),
+    Column("ogrn", String(32)),
+    Column("address", Text),
+    Column("settlement_account", String(64)),
+    Column("bik", String(32)),
+    Column("correspondent_account", String(64)),
+    Column("bank", String(255)),
+    Column("director", String(255)),
+    Column("contract", Text),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+directions = Table(
+    "directions",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False, unique=True, index=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+delivery_slots = Table(
+    "delivery_slots",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("direction_id", Integer, ForeignKey("directions.id"), index=True),
+    Column("date", Date, index=True),
+    Column("capacity", Integer),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+requests = Table(
+    "requests",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("request_number", Integer, nullable=False, unique=True, index=True),
+    Column("client_id", Integer, ForeignKey("clients.id"), nullable=False, index=True),
+    Column("direction_id", Integer, ForeignKey("directions.id"), nullable=False, index=True),
+    Column("delivery_slot_id", Integer, ForeignKey("delivery_slots.id"), nullable=False, index=True),
+    Column("boxes_count", Integer, nullable=False),
+    Column("weight_kg", Numeric(10, 2), nullable=False),
+    Column("volume_m3", Numeric(10, 2), nullable=False),
+    Column("comment", Text),
+    Column(
+        "status",
+        Enum("NEW", "WAREHOUSE", "SHIPPED", "DELIVERED", "PAID", "OPEN", "IN_PROGRESS", "DONE", name="requeststatus"),
+        nullable=False,
+        index=True,
+    ),
+    Column("created_at", DateTime(timezone=True), nullable=False, index=True),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
+
+request_history = Table(
+    "request_history",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("request_id", Integer, ForeignKey("requests.id"), nullable=False, index=True),
+    Column("event_type", String(64), nullable=False, index=True),
+    Column("from_status", String(32)),
+    Column("to_status", String(32)),
+    Column("changed_by_type", String(32), nullable=False),
+    Column("changed_by_id", Integer),
+    Column("comment", Text),
+    Column("created_at", DateTime(timezone=True), nullable=False, index=True),
+)
@@ -1,16 +1,42 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import make_url
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.db.pool_metrics import MeteredAsyncQueuePool
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
 
-engine = create_engine(settings.db_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+def async_db_url(db_url: str) -> URL:
+    url = make_url(db_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+def pool_options(name: str) -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_logging_name": name,
+    }
+
+
+async_engine = create_async_engine(
+    async_db_url(settings.db_url),
+    poolclass=MeteredAsyncQueuePool,
+    **pool_options("async"),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
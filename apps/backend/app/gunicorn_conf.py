@@ -0,0 +1,36 @@
+import os
+import shutil
+
+from app.core.config import settings, web_worker_count
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+
+bind = settings.web_bind
+workers = web_worker_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = settings.web_preload
+graceful_timeout = settings.web_graceful_timeout
+timeout = settings.web_graceful_timeout + 30
+keepalive = settings.web_keepalive
+max_requests = settings.web_max_requests
+max_requests_jitter = settings.web_max_requests // 10
+accesslog = "-"
+
+db_connections = workers * (settings.db_pool_size + settings.db_max_overflow)
+if db_connections > settings.db_max_connections:
+    raise RuntimeError(
+        f"{workers} workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) = {db_connections} connections "
+        f"exceeds DB_MAX_CONNECTIONS={settings.db_max_connections}"
+    )
+
+
+def on_starting(server) -> None:
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,16 +1,55 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
 from sqlalchemy import text
 
-from app.api import admin_auth, admin_clients, admin_organizations, admin_refs, admin_requests, telegram, webapp
-from app.db.base import Base
-from app.db.session import engine
+from app.api import (
+    admin_auth,
+    admin_clients,
+    admin_organizations,
+    admin_refs,
+    admin_requests,
+    admin_stats,
+    telegram,
+    webapp,
+)
+from app.bot.updates import updates
+from app.core.config import settings
+from app.db.migrations import LATEST_VERSION, current_version
+from app.db.pool_metrics import render_pool_metrics
+from app.db.session import async_engine
+from app.services.invoice_batch import shutdown_invoice_executor
+from app.services.notifications import dispatcher
+from app.services.telegram import close_http_client
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title="mini-crm api")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    async with async_engine.connect() as conn:
+        version = await conn.run_sync(current_version)
+    if version < LATEST_VERSION:
+        raise RuntimeError(
+            f"database schema is at version {version}, expected {LATEST_VERSION}; run `python -m app.db.migrations`"
+        )
+    dispatcher.start()
+    updates.start()
+    try:
+        yield
+    finally:
+        await updates.stop(timeout=settings.notification_drain_seconds)
+        await dispatcher.stop(timeout=settings.notification_drain_seconds)
+        await close_http_client()
+        shutdown_invoice_executor()
+        await async_engine.dispose()
+
+
+app = FastAPI(title="mini-crm api", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,25 +65,16 @@ app.include_router(admin_requests.router)
 app.include_router(admin_clients.router)
 app.include_router(admin_organizations.router)
 app.include_router(admin_refs.router)
-
-
-@app.on_event("startup")
-def startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    with engine.begin() as conn:
-        conn.execute(text("ALTER TABLE requests ADD COLUMN IF NOT EXISTS comment TEXT"))
-        conn.execute(text("ALTER TABLE directions DROP COLUMN IF EXISTS active"))
-        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS active"))
-        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS time_from"))
-        conn.execute(text("ALTER TABLE delivery_slots DROP COLUMN IF EXISTS time_to"))
-        conn.execute(text("ALTER TABLE organizations ADD COLUMN IF NOT EXISTS contract TEXT"))
-        if engine.dialect.name == "postgresql":
-            for value in ["NEW", "WAREHOUSE", "SHIPPED", "DELIVERED", "PAID"]:
-                conn.execute(text(f"ALTER TYPE requeststatus ADD VALUE IF NOT EXISTS '{value}'"))
+app.include_router(admin_stats.router)
 
 
 @app.get("/health")
-def health() -> dict:
-    with engine.connect() as conn:
-        conn.execute(text("SELECT 1"))
+async def health() -> dict:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(render_pool_metrics(), media_type=CONTENT_TYPE_LATEST)
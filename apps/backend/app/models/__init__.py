@@ -1,7 +1,9 @@
 from app.models.client import Client
+from app.models.counter import Counter
 from app.models.delivery_slot import DeliverySlot
 from app.models.direction import Direction
 from app.models.manager_user import ManagerUser
 from app.models.organization import Organization
 from app.models.request import Request, RequestStatus
 from app.models.request_history import RequestHistory
+from app.models.request_stat import RequestStat
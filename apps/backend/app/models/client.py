@@ -1,10 +1,15 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, DateTime, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, cast
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.organization import Organization
+    from app.models.request import Request
+
 
 class Client(Base):
     __tablename__ = "clients"
@@ -16,4 +21,24 @@ class Client(Base):
     last_name: Mapped[str | None] = mapped_column(String(128), nullable=True)
     consent_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
     consent_accepted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    requests_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    last_request_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+    requests: Mapped[list["Request"]] = relationship(back_populates="client", lazy="raise")
+    organization: Mapped["Organization | None"] = relationship(back_populates="client", uselist=False, lazy="raise")
+
+
+Index("ix_clients_created_at_id", Client.created_at, Client.id)
+Index(
+    "ix_clients_username_trgm",
+    Client.username,
+    postgresql_using="gin",
+    postgresql_ops={"username": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_clients_telegram_id_trgm",
+    cast(Client.telegram_id, Text).label("telegram_id_text"),
+    postgresql_using="gin",
+    postgresql_ops={"telegram_id_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
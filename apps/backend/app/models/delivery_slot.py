@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric
 from sqlalchemy.orm import mapped_column
 
 from app.db.base import Base
@@ -13,4 +13,10 @@ class DeliverySlot(Base):
     direction_id = mapped_column(Integer, ForeignKey("directions.id"), nullable=True, index=True)
     date = mapped_column(Date, index=True)
     capacity = mapped_column(Integer, nullable=True)
+    reserved_boxes = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    reserved_weight_kg = mapped_column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    reserved_volume_m3 = mapped_column(Numeric(12, 2), nullable=False, default=0, server_default="0")
     created_at = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+Index("ix_delivery_slots_direction_date", DeliverySlot.direction_id, DeliverySlot.date)
@@ -1,10 +1,14 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.client import Client
+
 
 class Organization(Base):
     __tablename__ = "organizations"
@@ -23,3 +27,19 @@ class Organization(Base):
     director: Mapped[str | None] = mapped_column(String(255), nullable=True)
     contract: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+    client: Mapped["Client"] = relationship(back_populates="organization", lazy="raise")
+
+
+Index(
+    "ix_organizations_name_trgm",
+    Organization.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_organizations_inn_trgm",
+    Organization.inn,
+    postgresql_using="gin",
+    postgresql_ops={"inn": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
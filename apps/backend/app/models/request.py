@@ -1,11 +1,18 @@
 import enum
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Numeric, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, Numeric, Text, cast, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.client import Client
+    from app.models.delivery_slot import DeliverySlot
+    from app.models.direction import Direction
+    from app.models.request_history import RequestHistory
+
 
 class RequestStatus(str, enum.Enum):
     NEW = "NEW"
@@ -20,9 +27,12 @@ class RequestStatus(str, enum.Enum):
 
 class Request(Base):
     __tablename__ = "requests"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    request_number: Mapped[int] = mapped_column(Integer, unique=True, index=True)
+    request_number: Mapped[int] = mapped_column(
+        Integer, server_default=text("nextval('request_number_seq')"), unique=True, index=True
+    )
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), index=True)
     direction_id: Mapped[int] = mapped_column(ForeignKey("directions.id"), index=True)
     delivery_slot_id: Mapped[int] = mapped_column(ForeignKey("delivery_slots.id"), index=True)
@@ -33,3 +43,22 @@ class Request(Base):
     status: Mapped[RequestStatus] = mapped_column(Enum(RequestStatus), default=RequestStatus.NEW, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    client: Mapped["Client"] = relationship(back_populates="requests", lazy="raise")
+    direction: Mapped["Direction"] = relationship(lazy="raise")
+    delivery_slot: Mapped["DeliverySlot"] = relationship(lazy="raise")
+    history: Mapped[list["RequestHistory"]] = relationship(
+        back_populates="request",
+        order_by="RequestHistory.created_at.desc()",
+        lazy="raise",
+    )
+
+
+Index("ix_requests_status_direction_created", Request.status, Request.direction_id, Request.created_at, Request.id)
+Index("ix_requests_client_created", Request.client_id, Request.created_at)
+Index(
+    "ix_requests_request_number_trgm",
+    cast(Request.request_number, Text).label("request_number_text"),
+    postgresql_using="gin",
+    postgresql_ops={"request_number_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
@@ -1,10 +1,14 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.request import Request
+
 
 class RequestHistory(Base):
     __tablename__ = "request_history"
@@ -18,3 +22,8 @@ class RequestHistory(Base):
     changed_by_id: Mapped[int | None] = mapped_column(nullable=True)
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, index=True)
+
+    request: Mapped["Request"] = relationship(back_populates="history", lazy="raise")
+
+
+Index("ix_request_history_request_created", RequestHistory.request_id, RequestHistory.created_at)
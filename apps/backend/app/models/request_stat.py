@@ -0,0 +1,16 @@
+from sqlalchemy import Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RequestStat(Base):
+    __tablename__ = "request_stats"
+
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    direction_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    delivery_slot_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    requests_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    boxes_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    weight_kg: Mapped[float] = mapped_column(Numeric(14, 2), default=0, server_default="0")
+    volume_m3: Mapped[float] = mapped_column(Numeric(14, 2), default=0, server_default="0")
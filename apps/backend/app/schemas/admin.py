@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from datetime import date, datetime
+
+from pydantic import BaseModel, EmailStr, Field
 
 from app.models.request import RequestStatus
 
@@ -8,6 +10,10 @@ class LoginIn(BaseModel):
     password: str
 
 
+class ManagerStatusIn(BaseModel):
+    active: bool
+
+
 class RequestUpdateIn(BaseModel):
     direction_id: int | None = None
     delivery_slot_id: int | None = None
@@ -18,6 +24,40 @@ class RequestUpdateIn(BaseModel):
     comment: str | None = None
 
 
+class BulkStatusIn(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+    status: RequestStatus
+    comment: str | None = None
+
+
+class RequestListItem(BaseModel):
+    id: int
+    request_number: int
+    created_at: datetime
+    telegram_id: int
+    username: str | None
+    organization: str | None
+    direction: str
+    delivery_date: date
+    boxes_count: int
+    volume_m3: float
+    weight_kg: float
+    status: RequestStatus
+
+
+class RequestPage(BaseModel):
+    items: list[RequestListItem]
+    next_cursor: str | None
+    total: int | None
+
+
+class InvoiceBatchIn(BaseModel):
+    ids: list[int] | None = None
+    status: RequestStatus | None = None
+    direction_id: int | None = None
+    q: str | None = None
+
+
 class DirectionIn(BaseModel):
     name: str
 
@@ -25,6 +65,7 @@ class DirectionIn(BaseModel):
 class DeliverySlotIn(BaseModel):
     direction_id: int | None = None
     date: str
+    capacity: int | None = Field(default=None, ge=0)
 
 
 class OrganizationIn(BaseModel):
@@ -40,3 +81,8 @@ class OrganizationIn(BaseModel):
     bank: str | None = None
     director: str | None = None
     contract: str | None = None
+
+
+class OrganizationOut(OrganizationIn):
+    id: int
+    contact_person: str | None
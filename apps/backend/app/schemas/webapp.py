@@ -1,5 +1,9 @@
+from datetime import date, datetime
+
 from pydantic import BaseModel, Field
 
+from app.models.request import RequestStatus
+
 
 class RequestCreate(BaseModel):
     direction_id: int
@@ -8,3 +12,18 @@ class RequestCreate(BaseModel):
     weight_kg: float = Field(gt=0)
     volume_m3: float = Field(gt=0)
     comment: str | None = None
+
+
+class MyRequestItem(BaseModel):
+    id: int
+    request_number: int
+    direction: str
+    delivery_date: date
+    boxes_count: int
+    weight_kg: float
+    volume_m3: float
+    telegram_id: int
+    username: str | None
+    comment: str | None
+    status: RequestStatus
+    created_at: datetime
@@ -1,23 +1,47 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from fastapi import Depends, HTTPException, Request
 from jose import jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.manager_user import ManagerUser
+from app.services.ttl_cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+)
+_manager_cache = TTLCache(maxsize=1024)
+_password_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password-hash")
+_password_slots = asyncio.Semaphore(settings.password_hash_queue)
 
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+async def _run_password_job(func, *args):
+    if _password_slots.locked():
+        raise HTTPException(status_code=503, detail="too many login attempts in progress", headers={"Retry-After": "1"})
+    async with _password_slots:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    return await _run_password_job(pwd_context.verify_and_update, password, hashed)
 
 
 def create_access_token(sub: str) -> str:
@@ -33,12 +57,22 @@ def decode_access_token(token: str) -> dict:
         raise HTTPException(status_code=401, detail="invalid token") from exc
 
 
-def get_current_manager(request: Request, db: Session = Depends(get_db)) -> ManagerUser:
+def revoke_manager(manager_id: int) -> None:
+    _manager_cache.pop(manager_id)
+
+
+async def get_current_manager(request: Request, db: AsyncSession = Depends(get_async_db)) -> ManagerUser:
     token = request.cookies.get("admin_token")
     if not token:
         raise HTTPException(status_code=401, detail="unauthorized")
     payload = decode_access_token(token)
-    manager = db.query(ManagerUser).filter(ManagerUser.id == int(payload["sub"]), ManagerUser.active.is_(True)).first()
+    manager_id = int(payload["sub"])
+    manager = _manager_cache.get(manager_id)
+    if manager is not None:
+        return manager
+    manager = await db.scalar(select(ManagerUser).where(ManagerUser.id == manager_id, ManagerUser.active.is_(True)))
     if not manager:
         raise HTTPException(status_code=401, detail="unauthorized")
+    db.expunge(manager)
+    _manager_cache.set(manager_id, manager, time.time() + settings.manager_cache_seconds)
     return manager
@@ -0,0 +1,68 @@
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from sqlalchemy import inspect
+
+from app.core.config import available_cpus, settings, web_worker_count
+from app.services.invoice_pdf import build_request_invoice_pdf
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _worker_count() -> int:
+    return settings.invoice_workers or max(1, available_cpus() // web_worker_count())
+
+
+def get_invoice_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=_worker_count(), mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_invoice_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def snapshot(row) -> SimpleNamespace | None:
+    if row is None:
+        return None
+    return SimpleNamespace(**{attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs})
+
+
+def _render(job: tuple) -> tuple[str, bytes]:
+    req, client, direction, slot, org = job
+    return f"invoice-request-{req.request_number}.pdf", build_request_invoice_pdf(req, client, direction, slot, org)
+
+
+class _ZipSink:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_invoice_zip(jobs: list[tuple]):
+    executor = get_invoice_executor()
+    chunksize = max(1, len(jobs) // (_worker_count() * 4))
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, content in executor.map(_render, jobs, chunksize=chunksize):
+            archive.writestr(filename, content)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from app.core.config import settings, web_worker_count
+from app.services.invoice_pdf import INVOICE_LAYOUT
+
+_LAYOUT_VERSION = hashlib.sha256(repr(INVOICE_LAYOUT).encode()).hexdigest()[:12]
+_lock = threading.Lock()
+_unscanned_bytes: int | None = None
+
+
+def invoice_key(inputs: dict) -> str:
+    raw = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(f"{_LAYOUT_VERSION}:{raw}".encode()).hexdigest()
+
+
+def _request_dir(request_id: int) -> Path:
+    return Path(settings.invoice_cache_dir) / str(request_id)
+
+
+def get_cached_invoice(request_id: int, key: str) -> bytes | None:
+    path = _request_dir(request_id) / f"{key}.pdf"
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return content
+
+
+def store_invoice(request_id: int, key: str, content: bytes) -> None:
+    global _unscanned_bytes
+    request_dir = _request_dir(request_id)
+    request_dir.mkdir(parents=True, exist_ok=True)
+    path = request_dir / f"{key}.pdf"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    except FileNotFoundError:
+        return
+    with _lock:
+        due = _unscanned_bytes is None or _unscanned_bytes + len(content) >= _scan_interval_bytes()
+        _unscanned_bytes = 0 if due else _unscanned_bytes + len(content)
+    if due:
+        _evict()
+
+
+def invalidate_invoices(request_ids) -> None:
+    global _unscanned_bytes
+    freed = 0
+    for request_id in request_ids:
+        request_dir = _request_dir(request_id)
+        freed += sum(size for _, size, _ in _scan_dir(request_dir))
+        shutil.rmtree(request_dir, ignore_errors=True)
+    with _lock:
+        if _unscanned_bytes is not None:
+            _unscanned_bytes -= freed
+
+
+def _scan_interval_bytes() -> int:
+    return settings.invoice_cache_max_bytes // (10 * web_worker_count())
+
+
+def _scan_dir(path: Path) -> list[tuple[float, int, Path]]:
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return entries
+
+
+def _scan() -> list[tuple[float, int, Path]]:
+    try:
+        request_dirs = list(Path(settings.invoice_cache_dir).iterdir())
+    except FileNotFoundError:
+        return []
+    return [entry for request_dir in request_dirs for entry in _scan_dir(request_dir)]
+
+
+def _evict() -> None:
+    entries = sorted(_scan())
+    total = sum(size for _, size, _ in entries)
+    if total <= settings.invoice_cache_max_bytes * 9 // 10:
+        return
+    target = settings.invoice_cache_max_bytes * 8 // 10
+    for _, size, path in entries:
+        if total <= target:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
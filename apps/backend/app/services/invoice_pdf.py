@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 
@@ -16,14 +17,61 @@ from app.models.organization import Organization
 from app.models.request import Request
 
 
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+
+# (font size, gap after the line, template); empty templates are spacer lines.
+INVOICE_LAYOUT = (
+    (16, 26, "Счет на оплату по заявке №{request_number}"),
+    (11, 16, "Дата формирования: {generated_at}"),
+    (11, 16, ""),
+    (13, 20, "Плательщик"),
+    (11, 16, "Организация: {org_name}"),
+    (11, 16, "ИНН: {inn}   КПП: {kpp}"),
+    (11, 16, "ОГРН: {ogrn}"),
+    (11, 16, "Адрес: {address}"),
+    (11, 16, "Контакт (Telegram): @{username}"),
+    (11, 16, ""),
+    (13, 20, "Реквизиты получателя"),
+    (11, 16, "Банк: {bank}"),
+    (11, 16, "Р/счет: {settlement_account}"),
+    (11, 16, "Корсчет: {correspondent_account}"),
+    (11, 16, "БИК: {bik}"),
+    (11, 16, ""),
+    (13, 20, "Основание начисления"),
+    (11, 16, "Направление: {direction}"),
+    (11, 16, "Дата доставки: {delivery_date}"),
+    (11, 16, "Кол-во коробов: {boxes_count}"),
+    (11, 16, "Вес (кг): {weight_kg:.2f}"),
+    (11, 16, "Объем (м3): {volume_m3:.2f}"),
+    (11, 16, "Комментарий: {comment}"),
+    (11, 16, ""),
+    (12, 22, "Сумма к оплате: согласно договору и действующему прайсу."),
+    (11, 16, "Договор: {contract}"),
+    (11, 16, ""),
+    (10, 16, "Документ сформирован автоматически в Mini CRM."),
+)
+
+ORG_FIELDS = (
+    "inn",
+    "kpp",
+    "ogrn",
+    "address",
+    "bank",
+    "settlement_account",
+    "correspondent_account",
+    "bik",
+    "contract",
+)
+
+
+@lru_cache(maxsize=1)
 def _pick_font() -> str:
     font_name = "InvoiceSans"
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/dejavu/DejaVuSans.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-    ]
-    for item in candidates:
+    for item in FONT_CANDIDATES:
         path = Path(item)
         if path.exists():
             pdfmetrics.registerFont(TTFont(font_name, str(path)))
@@ -31,6 +79,40 @@ def _pick_font() -> str:
     return "Helvetica"
 
 
+@lru_cache(maxsize=1)
+def _compiled_layout() -> tuple[tuple[float, int, str, bool], ...]:
+    _, height = A4
+    y = height - 56
+    lines = []
+    for size, gap, template in INVOICE_LAYOUT:
+        if template:
+            lines.append((y, size, template, "{" in template))
+        y -= gap
+    return tuple(lines)
+
+
+def invoice_inputs(
+    req: Request,
+    client: Client,
+    direction: Direction,
+    slot: DeliverySlot,
+    org: Organization | None,
+) -> dict:
+    fields = {key: (getattr(org, key, None) if org else None) or "-" for key in ORG_FIELDS}
+    fields.update(
+        request_number=req.request_number,
+        org_name=org.name if org and org.name else "-",
+        username=client.username,
+        direction=direction.name,
+        delivery_date=slot.date,
+        boxes_count=req.boxes_count,
+        weight_kg=float(req.weight_kg),
+        volume_m3=float(req.volume_m3),
+        comment=req.comment or "-",
+    )
+    return fields
+
+
 def build_request_invoice_pdf(
     req: Request,
     client: Client,
@@ -40,46 +122,16 @@ def build_request_invoice_pdf(
 ) -> bytes:
     buffer = BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
     font = _pick_font()
+    fields = invoice_inputs(req, client, direction, slot, org)
+    fields["generated_at"] = datetime.now(timezone.utc).astimezone().strftime("%d.%m.%Y %H:%M")
 
-    y = height - 56
-
-    def draw(line: str, size: int = 11, gap: int = 16) -> None:
-        nonlocal y
-        pdf.setFont(font, size)
-        pdf.drawString(48, y, line)
-        y -= gap
-
-    now = datetime.now(timezone.utc).astimezone()
-    draw(f"Счет на оплату по заявке №{req.request_number}", 16, 26)
-    draw(f"Дата формирования: {now.strftime('%d.%m.%Y %H:%M')}")
-    draw("")
-    draw("Плательщик", 13, 20)
-    draw(f"Организация: {org.name if org and org.name else '-'}")
-    draw(f"ИНН: {org.inn if org and org.inn else '-'}   КПП: {org.kpp if org and org.kpp else '-'}")
-    draw(f"ОГРН: {org.ogrn if org and org.ogrn else '-'}")
-    draw(f"Адрес: {org.address if org and org.address else '-'}")
-    draw(f"Контакт (Telegram): @{client.username}")
-    draw("")
-    draw("Реквизиты получателя", 13, 20)
-    draw(f"Банк: {org.bank if org and org.bank else '-'}")
-    draw(f"Р/счет: {org.settlement_account if org and org.settlement_account else '-'}")
-    draw(f"Корсчет: {org.correspondent_account if org and org.correspondent_account else '-'}")
-    draw(f"БИК: {org.bik if org and org.bik else '-'}")
-    draw("")
-    draw("Основание начисления", 13, 20)
-    draw(f"Направление: {direction.name}")
-    draw(f"Дата доставки: {slot.date}")
-    draw(f"Кол-во коробов: {req.boxes_count}")
-    draw(f"Вес (кг): {float(req.weight_kg):.2f}")
-    draw(f"Объем (м3): {float(req.volume_m3):.2f}")
-    draw(f"Комментарий: {req.comment or '-'}")
-    draw("")
-    draw("Сумма к оплате: согласно договору и действующему прайсу.", 12, 22)
-    draw(f"Договор: {org.contract if org and org.contract else '-'}")
-    draw("")
-    draw("Документ сформирован автоматически в Mini CRM.", 10, 16)
+    current_size = None
+    for y, size, template, has_fields in _compiled_layout():
+        if size != current_size:
+            pdf.setFont(font, size)
+            current_size = size
+        pdf.drawString(48, y, template.format(**fields) if has_fields else template)
 
     pdf.showPage()
     pdf.save()
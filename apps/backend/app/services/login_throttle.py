@@ -0,0 +1,47 @@
+import threading
+import time
+from collections import deque
+
+from app.core.config import settings
+
+
+class SlidingWindowCounter:
+    def __init__(self, limit: int, window_seconds: int, maxkeys: int = 100000) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.maxkeys = maxkeys
+        self._hits: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> deque[float]:
+        hits = self._hits.get(key)
+        if hits is None:
+            return deque()
+        while hits and hits[0] <= now - self.window_seconds:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+        return hits
+
+    def retry_after(self, key: str) -> int:
+        with self._lock:
+            now = time.monotonic()
+            hits = self._prune(key, now)
+            if len(hits) < self.limit:
+                return 0
+            return int(hits[0] + self.window_seconds - now) + 1
+
+    def hit(self, key: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if key not in self._hits and len(self._hits) >= self.maxkeys:
+                self._hits.pop(next(iter(self._hits)))
+            self._hits.setdefault(key, deque()).append(now)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+attempts_by_ip = SlidingWindowCounter(settings.login_max_attempts_per_ip, settings.login_window_seconds)
+failures_by_email = SlidingWindowCounter(settings.login_max_failures_per_email, settings.login_window_seconds)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import settings, web_worker_count
+from app.services.telegram import send_telegram_message
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+
+@dataclass
+class Notification:
+    chat_id: int
+    text: str
+    reply_markup: dict | None = None
+    attempt: int = 0
+
+
+class RateLimiter:
+    def __init__(self, global_rate: float, chat_interval: float) -> None:
+        self.global_interval = 1 / global_rate if global_rate > 0 else 0
+        self.chat_interval = chat_interval
+        self._next_global = 0.0
+        self._next_chat: dict[int, float] = {}
+
+    async def acquire(self, chat_id: int) -> None:
+        now = time.monotonic()
+        chat_slot = max(now, self._next_chat.get(chat_id, 0.0))
+        self._next_chat[chat_id] = chat_slot + self.chat_interval
+        if len(self._next_chat) > 10000:
+            self._next_chat = {key: value for key, value in self._next_chat.items() if value > now}
+        if chat_slot > now:
+            await asyncio.sleep(chat_slot - now)
+
+        now = time.monotonic()
+        global_slot = max(now, self._next_global)
+        self._next_global = global_slot + self.global_interval
+        if global_slot > now:
+            await asyncio.sleep(global_slot - now)
+
+    def pause_chat(self, chat_id: int, seconds: float) -> None:
+        self._next_chat[chat_id] = max(self._next_chat.get(chat_id, 0.0), time.monotonic() + seconds)
+
+
+class NotificationDispatcher:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[Notification] | None = None
+        self.limiter: RateLimiter | None = None
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.queue = asyncio.Queue(maxsize=settings.notification_queue_size)
+        global_rate = settings.telegram_global_rate_per_second / web_worker_count()
+        self.limiter = RateLimiter(global_rate, settings.telegram_chat_interval_seconds)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(settings.notification_workers)]
+
+    async def stop(self, timeout: float = 10) -> None:
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("dropping %s undelivered notifications", self.queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, chat_id: int, text: str, reply_markup: dict | None = None) -> None:
+        if not settings.bot_token:
+            return
+        if not self.running:
+            logger.warning("notification dispatcher is not running, dropping message to %s", chat_id)
+            return
+        try:
+            self.queue.put_nowait(Notification(chat_id, text, reply_markup))
+        except asyncio.QueueFull:
+            logger.warning("notification queue is full, dropping message to %s", chat_id)
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self.queue.get()
+            try:
+                await self._deliver(item)
+            except Exception:
+                logger.exception("notification to %s failed", item.chat_id)
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, item: Notification) -> None:
+        while item.attempt < MAX_ATTEMPTS:
+            item.attempt += 1
+            await self.limiter.acquire(item.chat_id)
+            try:
+                response = await send_telegram_message(item.chat_id, item.text, item.reply_markup)
+            except httpx.HTTPError as exc:
+                logger.warning("telegram request to %s failed: %s", item.chat_id, exc)
+                await asyncio.sleep(2**item.attempt)
+                continue
+            if response is None or response.status_code < 400:
+                return
+            if response.status_code == 429:
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                self.limiter.pause_chat(item.chat_id, retry_after)
+                continue
+            if response.status_code >= 500:
+                await asyncio.sleep(2**item.attempt)
+                continue
+            logger.warning("telegram rejected message to %s: %s %s", item.chat_id, response.status_code, response.text)
+            return
+        logger.warning("giving up on message to %s after %s attempts", item.chat_id, item.attempt)
+
+
+dispatcher = NotificationDispatcher()
+
+
+def notify(chat_id: int, text: str, reply_markup: dict | None = None) -> None:
+    dispatcher.enqueue(chat_id, text, reply_markup)
@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, row_id: int, rank: int | None = None) -> str:
+    keys = [created_at.isoformat(), row_id]
+    if rank is not None:
+        keys.append(rank)
+    raw = json.dumps(keys, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, int | None]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        keys = json.loads(raw)
+        rank = int(keys[2]) if len(keys) > 2 else None
+        return datetime.fromisoformat(keys[0]), int(keys[1]), rank
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="invalid cursor") from exc
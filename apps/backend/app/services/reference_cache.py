@@ -0,0 +1,66 @@
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from fastapi import Response
+
+from app.core.config import settings
+
+
+@dataclass
+class CachedPayload:
+    version: int
+    day: date
+    expires_at: float
+    data: Any
+    body: bytes
+    etag: str
+
+
+_versions: dict[str, int] = {}
+_entries: dict[str, CachedPayload] = {}
+
+
+def bump_reference_version(*keys: str) -> None:
+    for key in keys:
+        _versions[key] = _versions.get(key, 0) + 1
+        _entries.pop(key, None)
+
+
+async def cached_payload(key: str, loader: Callable[[], Awaitable[Any]]) -> CachedPayload:
+    today = date.today()
+    entry = _entries.get(key)
+    if entry and entry.version == _versions.get(key, 0) and entry.day == today and entry.expires_at > time.monotonic():
+        return entry
+    version = _versions.get(key, 0)
+    entry = _encode(version, today, time.monotonic() + settings.reference_cache_seconds, await loader())
+    if version == _versions.get(key, 0):
+        _entries[key] = entry
+    return entry
+
+
+def derived_payload(entry: CachedPayload, data: Any) -> CachedPayload:
+    return _encode(entry.version, entry.day, entry.expires_at, data)
+
+
+def _encode(version: int, day: date, expires_at: float, data: Any) -> CachedPayload:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    return CachedPayload(
+        version=version,
+        day=day,
+        expires_at=expires_at,
+        data=data,
+        body=body,
+        etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"',
+    )
+
+
+def payload_response(entry: CachedPayload, if_none_match: str | None) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={settings.reference_cache_seconds}"}
+    if if_none_match and entry.etag in [item.strip() for item in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
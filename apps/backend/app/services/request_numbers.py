@@ -0,0 +1,58 @@
+import asyncio
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.counter import Counter
+from app.models.request import Request
+
+COUNTER_NAME = "request_number"
+BLOCK_SIZE = 50
+
+
+class BlockAllocator:
+    def __init__(self, block_size: int = BLOCK_SIZE) -> None:
+        self.block_size = block_size
+        self._lock = asyncio.Lock()
+        self._next = 1
+        self._limit = 0
+
+    async def allocate(self, bind: AsyncEngine) -> int:
+        async with self._lock:
+            if self._next > self._limit:
+                self._limit = await self._reserve(bind)
+                self._next = self._limit - self.block_size + 1
+            value = self._next
+            self._next += 1
+            return value
+
+    async def _reserve(self, bind: AsyncEngine) -> int:
+        for _ in range(3):
+            try:
+                async with bind.begin() as conn:
+                    top = (
+                        await conn.execute(
+                            update(Counter)
+                            .where(Counter.name == COUNTER_NAME)
+                            .values(value=Counter.value + self.block_size)
+                            .returning(Counter.value)
+                        )
+                    ).scalar()
+                    if top is None:
+                        current = (await conn.execute(select(func.max(Request.request_number)))).scalar() or 0
+                        top = current + self.block_size
+                        await conn.execute(insert(Counter).values(name=COUNTER_NAME, value=top))
+                    return top
+            except IntegrityError:
+                continue
+        raise RuntimeError("could not reserve request numbers")
+
+
+_allocator = BlockAllocator()
+
+
+async def assign_request_number(db: AsyncSession, req: Request) -> None:
+    if db.bind.dialect.name == "postgresql":
+        return
+    req.request_number = await _allocator.allocate(db.bind)
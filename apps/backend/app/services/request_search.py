@@ -0,0 +1,63 @@
+from sqlalchemy import Text, case, cast, func, or_, select
+from sqlalchemy.orm import aliased
+
+from app.models.client import Client
+from app.models.organization import Organization
+from app.models.request import Request
+
+
+def normalize_query(q: str) -> str:
+    return q.strip().lstrip("@")
+
+
+def _contains(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _starts_with(term: str) -> str:
+    return _contains(term)[1:]
+
+
+def _matching_clients(term: str):
+    pattern = _contains(term)
+    return select(Client.id).where(
+        or_(
+            Client.username.ilike(pattern, escape="\\"),
+            cast(Client.telegram_id, Text).ilike(pattern, escape="\\"),
+        )
+    ).union(
+        select(Organization.client_id).where(
+            or_(
+                Organization.name.ilike(pattern, escape="\\"),
+                Organization.inn.ilike(pattern, escape="\\"),
+            )
+        )
+    )
+
+
+def search_condition(term: str):
+    matched = aliased(Request)
+    return Request.id.in_(
+        select(matched.id)
+        .where(matched.client_id.in_(_matching_clients(term)))
+        .union(select(matched.id).where(cast(matched.request_number, Text).ilike(_contains(term), escape="\\")))
+    )
+
+
+def client_search_condition(term: str):
+    return Client.id.in_(_matching_clients(term))
+
+
+def search_rank(term: str):
+    prefix = _starts_with(term)
+    return case(
+        (cast(Request.request_number, Text) == term, 4),
+        (cast(Client.telegram_id, Text) == term, 4),
+        (func.lower(Client.username) == term.lower(), 3),
+        (Organization.inn == term, 3),
+        (Client.username.ilike(prefix, escape="\\"), 2),
+        (Organization.name.ilike(prefix, escape="\\"), 2),
+        (Organization.inn.ilike(prefix, escape="\\"), 2),
+        else_=1,
+    )
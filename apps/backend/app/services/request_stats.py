@@ -0,0 +1,187 @@
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.delivery_slot import DeliverySlot
+from app.models.direction import Direction
+from app.models.request import Request
+from app.models.request_stat import RequestStat
+from app.services.slot_capacity import normalize_amount
+
+REBUILD_SQL = """
+INSERT INTO request_stats (status, direction_id, delivery_slot_id, requests_count, boxes_count, weight_kg, volume_m3)
+SELECT status, direction_id, delivery_slot_id, COUNT(*), SUM(boxes_count), SUM(weight_kg), SUM(volume_m3)
+FROM requests
+GROUP BY status, direction_id, delivery_slot_id
+"""
+
+CLIENT_COUNTERS_SQL = """
+UPDATE clients SET
+    requests_count = (SELECT COUNT(*) FROM requests r WHERE r.client_id = clients.id),
+    last_request_at = (SELECT MAX(r.created_at) FROM requests r WHERE r.client_id = clients.id)
+"""
+
+StatsKey = tuple[str, int, int, int, float, float]
+
+
+def stats_key(req: Request) -> StatsKey:
+    return (req.status.value, req.direction_id, req.delivery_slot_id, req.boxes_count, req.weight_kg, req.volume_m3)
+
+
+def rebuild_request_stats(conn: Connection) -> None:
+    conn.execute(delete(RequestStat))
+    conn.execute(text(REBUILD_SQL))
+
+
+def rebuild_client_counters(conn: Connection) -> None:
+    conn.execute(text(CLIENT_COUNTERS_SQL))
+
+
+def _add(deltas: dict, key: StatsKey, sign: int, count: int = 1) -> None:
+    status, direction_id, slot_id, boxes, weight_kg, volume_m3 = key
+    bucket = deltas.setdefault((status, direction_id, slot_id), [0, 0, Decimal(0), Decimal(0)])
+    bucket[0] += sign * count
+    bucket[1] += sign * boxes
+    bucket[2] += sign * normalize_amount(weight_kg)
+    bucket[3] += sign * normalize_amount(volume_m3)
+
+
+async def _apply(db: AsyncSession, deltas: dict) -> None:
+    if not deltas:
+        return
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(RequestStat).values(
+        [
+            {
+                "status": status,
+                "direction_id": direction_id,
+                "delivery_slot_id": slot_id,
+                "requests_count": count,
+                "boxes_count": boxes,
+                "weight_kg": weight_kg,
+                "volume_m3": volume_m3,
+            }
+            for (status, direction_id, slot_id), (count, boxes, weight_kg, volume_m3) in sorted(deltas.items())
+        ]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RequestStat.status, RequestStat.direction_id, RequestStat.delivery_slot_id],
+            set_={
+                "requests_count": RequestStat.requests_count + stmt.excluded.requests_count,
+                "boxes_count": RequestStat.boxes_count + stmt.excluded.boxes_count,
+                "weight_kg": RequestStat.weight_kg + stmt.excluded.weight_kg,
+                "volume_m3": RequestStat.volume_m3 + stmt.excluded.volume_m3,
+            },
+        )
+    )
+
+
+async def record_request(db: AsyncSession, req: Request) -> None:
+    deltas: dict = {}
+    _add(deltas, stats_key(req), 1)
+    await _apply(db, deltas)
+    await db.execute(
+        update(Client)
+        .where(Client.id == req.client_id)
+        .values(
+            requests_count=Client.requests_count + 1,
+            last_request_at=req.created_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def move_request(db: AsyncSession, before: StatsKey, after: StatsKey) -> None:
+    if before == after:
+        return
+    deltas: dict = {}
+    _add(deltas, before, -1)
+    _add(deltas, after, 1)
+    await _apply(db, deltas)
+
+
+async def move_status(db: AsyncSession, keys: list[StatsKey], status: str) -> None:
+    deltas: dict = {}
+    for key in keys:
+        _add(deltas, key, -1)
+        _add(deltas, (status, *key[1:]), 1)
+    await _apply(db, deltas)
+
+
+def _totals(row) -> dict:
+    return {
+        "requests_count": int(row.requests_count or 0),
+        "boxes_count": int(row.boxes_count or 0),
+        "weight_kg": float(row.weight_kg or 0),
+        "volume_m3": float(row.volume_m3 or 0),
+    }
+
+
+def _sums():
+    return (
+        func.sum(RequestStat.requests_count).label("requests_count"),
+        func.sum(RequestStat.boxes_count).label("boxes_count"),
+        func.sum(RequestStat.weight_kg).label("weight_kg"),
+        func.sum(RequestStat.volume_m3).label("volume_m3"),
+    )
+
+
+async def load_dashboard(db: AsyncSession) -> dict:
+    active = RequestStat.requests_count > 0
+    totals = (await db.execute(select(*_sums()).where(active))).one()
+    by_status = (
+        await db.execute(select(RequestStat.status, *_sums()).where(active).group_by(RequestStat.status))
+    ).all()
+    by_direction = (
+        await db.execute(
+            select(RequestStat.direction_id, Direction.name, RequestStat.status, *_sums())
+            .outerjoin(Direction, Direction.id == RequestStat.direction_id)
+            .where(active)
+            .group_by(RequestStat.direction_id, Direction.name, RequestStat.status)
+            .order_by(Direction.name)
+        )
+    ).all()
+    by_date = (
+        await db.execute(
+            select(DeliverySlot.date, *_sums())
+            .join(DeliverySlot, DeliverySlot.id == RequestStat.delivery_slot_id)
+            .where(active)
+            .group_by(DeliverySlot.date)
+            .order_by(DeliverySlot.date)
+        )
+    ).all()
+
+    directions: dict[int, dict] = {}
+    for row in by_direction:
+        item = directions.setdefault(
+            row.direction_id,
+            {
+                "direction_id": row.direction_id,
+                "direction": row.name,
+                "by_status": {},
+                "requests_count": 0,
+                "boxes_count": 0,
+                "weight_kg": Decimal(0),
+                "volume_m3": Decimal(0),
+            },
+        )
+        item["requests_count"] += row.requests_count or 0
+        item["boxes_count"] += row.boxes_count or 0
+        item["weight_kg"] += row.weight_kg or 0
+        item["volume_m3"] += row.volume_m3 or 0
+        item["by_status"][row.status] = int(row.requests_count or 0)
+    for item in directions.values():
+        item["weight_kg"] = float(item["weight_kg"])
+        item["volume_m3"] = float(item["volume_m3"])
+
+    return {
+        "totals": _totals(totals),
+        "by_status": [{"status": row.status, **_totals(row)} for row in by_status],
+        "by_direction": list(directions.values()),
+        "by_delivery_date": [{"date": str(row.date), **_totals(row)} for row in by_date],
+    }
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import or_, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.delivery_slot import DeliverySlot
+
+CENTS = Decimal("0.01")
+
+RECALCULATE_SQL = """
+UPDATE delivery_slots SET
+    reserved_boxes = COALESCE((SELECT SUM(r.boxes_count) FROM requests r WHERE r.delivery_slot_id = delivery_slots.id), 0),
+    reserved_weight_kg = COALESCE((SELECT SUM(r.weight_kg) FROM requests r WHERE r.delivery_slot_id = delivery_slots.id), 0),
+    reserved_volume_m3 = COALESCE((SELECT SUM(r.volume_m3) FROM requests r WHERE r.delivery_slot_id = delivery_slots.id), 0)
+"""
+
+
+def recalculate_slot_totals(conn: Connection) -> None:
+    conn.execute(text(RECALCULATE_SQL))
+
+
+def normalize_amount(value) -> Decimal:
+    return Decimal(str(value)).quantize(CENTS)
+
+
+def slot_load(slot_id: int, boxes: int, weight_kg, volume_m3) -> tuple[int, int, Decimal, Decimal]:
+    return slot_id, boxes, normalize_amount(weight_kg), normalize_amount(volume_m3)
+
+
+def remaining_boxes(slot: DeliverySlot) -> int | None:
+    if slot.capacity is None:
+        return None
+    return max(slot.capacity - slot.reserved_boxes, 0)
+
+
+async def reserve_slot(db: AsyncSession, slot_id: int, boxes: int, weight_kg: float, volume_m3: float) -> None:
+    result = await db.execute(
+        update(DeliverySlot)
+        .where(
+            DeliverySlot.id == slot_id,
+            or_(DeliverySlot.capacity.is_(None), DeliverySlot.reserved_boxes + boxes <= DeliverySlot.capacity),
+        )
+        .values(
+            reserved_boxes=DeliverySlot.reserved_boxes + boxes,
+            reserved_weight_kg=DeliverySlot.reserved_weight_kg + weight_kg,
+            reserved_volume_m3=DeliverySlot.reserved_volume_m3 + volume_m3,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="delivery slot is full")
+
+
+async def release_slot(db: AsyncSession, slot_id: int, boxes: int, weight_kg: float, volume_m3: float) -> None:
+    await db.execute(
+        update(DeliverySlot)
+        .where(DeliverySlot.id == slot_id)
+        .values(
+            reserved_boxes=DeliverySlot.reserved_boxes - boxes,
+            reserved_weight_kg=DeliverySlot.reserved_weight_kg - weight_kg,
+            reserved_volume_m3=DeliverySlot.reserved_volume_m3 - volume_m3,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def move_reservation(db: AsyncSession, before: tuple, after: tuple) -> bool:
+    if before == after:
+        return False
+    old_slot, old_boxes, old_weight, old_volume = before
+    new_slot, new_boxes, new_weight, new_volume = after
+    if old_slot != new_slot:
+        steps = sorted([(old_slot, release_slot, before), (new_slot, reserve_slot, after)], key=lambda step: step[0])
+        for _, apply, load in steps:
+            await apply(db, *load)
+        return True
+    boxes, weight_kg, volume_m3 = new_boxes - old_boxes, new_weight - old_weight, new_volume - old_volume
+    if boxes > 0:
+        await reserve_slot(db, new_slot, boxes, weight_kg, volume_m3)
+    else:
+        await release_slot(db, new_slot, -boxes, -weight_kg, -volume_m3)
+    return True
@@ -2,19 +2,26 @@ import hashlib
 import hmac
 import json
 import time
+from functools import lru_cache
 from urllib.parse import parse_qsl
 
 import httpx
 
 from app.core.config import settings
 
+_http_client: httpx.AsyncClient | None = None
 
-def validate_init_data(init_data: str) -> dict:
+
+@lru_cache(maxsize=4)
+def _secret_key(bot_token: str) -> bytes:
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+def verify_init_data(init_data: str) -> tuple[dict, int]:
     parsed = dict(parse_qsl(init_data, keep_blank_values=True))
     recv_hash = parsed.pop("hash", "")
     data_check_string = "\n".join([f"{k}={v}" for k, v in sorted(parsed.items())])
-    secret_key = hmac.new(b"WebAppData", settings.bot_token.encode(), hashlib.sha256).digest()
-    calc_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    calc_hash = hmac.new(_secret_key(settings.bot_token), data_check_string.encode(), hashlib.sha256).hexdigest()
 
     if not hmac.compare_digest(calc_hash, recv_hash):
         raise ValueError("invalid initData hash")
@@ -26,13 +33,31 @@ def validate_init_data(init_data: str) -> dict:
     user = json.loads(parsed.get("user", "{}"))
     if not user:
         raise ValueError("user missing")
-    return user
+    return user, auth_date + settings.telegram_initdata_ttl_seconds
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=f"https://api.telegram.org/bot{settings.bot_token}/",
+            timeout=10,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
-async def send_telegram_message(chat_id: int, text: str) -> None:
+async def send_telegram_message(chat_id: int, text: str, reply_markup: dict | None = None) -> httpx.Response | None:
     if not settings.bot_token:
-        return
-    url = f"https://api.telegram.org/bot{settings.bot_token}/sendMessage"
+        return None
     payload = {"chat_id": chat_id, "text": text}
-    async with httpx.AsyncClient(timeout=10) as client:
-        await client.post(url, json=payload)
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+    return await get_http_client().post("sendMessage", json=payload)
@@ -0,0 +1,25 @@
+import hashlib
+import time
+
+from app.core.config import settings
+from app.models.client import Client
+from app.services.ttl_cache import TTLCache
+
+_client_cache = TTLCache(settings.webapp_auth_cache_size)
+
+
+def _cache_key(init_data: str) -> bytes:
+    return hashlib.sha256(init_data.encode()).digest()
+
+
+def get_cached_client(init_data: str) -> Client | None:
+    return _client_cache.get(_cache_key(init_data))
+
+
+def cache_client(init_data: str, client: Client, init_data_expires_at: float) -> None:
+    expires_at = min(init_data_expires_at, time.time() + settings.webapp_client_cache_seconds)
+    _client_cache.set(_cache_key(init_data), client, expires_at)
+
+
+def forget_client(telegram_id: int) -> None:
+    _client_cache.discard_where(lambda client: client.telegram_id == telegram_id)
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.engine import Engine
+
+from app.services.reference_cache import bump_reference_version
+
+LARGE_TABLES = {"requests", "request_history", "delivery_slots", "clients", "organizations"}
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+
+def _explain(db_engine: Engine, statements: list[tuple[str, dict]], marker: str) -> dict:
+    matching = [(statement, parameters) for statement, parameters in statements if marker in statement]
+    assert matching, f"no statement containing {marker!r} was executed"
+    statement, parameters = matching[-1]
+    with db_engine.connect() as conn:
+        return conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+
+
+def _nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_nodes(child))
+    return nodes
+
+
+def assert_index_plan(plan: dict, *tables: str) -> None:
+    nodes = _nodes(plan)
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    summary = [(node["Node Type"], node.get("Relation Name"), node.get("Plan Rows")) for node in nodes]
+    assert not LARGE_TABLES.intersection(seq_scans), f"sequential scan on {seq_scans}: {summary}"
+    indexed = {node.get("Relation Name") for node in nodes if node["Node Type"] in INDEX_SCANS}
+    assert set(tables) <= indexed, f"{set(tables) - indexed} not read through an index"
+
+
+def test_admin_list_plan(client, db_engine, statements):
+    assert client.get("/api/admin/requests").status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM requests"), "requests")
+
+
+def test_admin_list_filtered_plan(client, db_engine, statements):
+    response = client.get("/api/admin/requests", params={"status": "SHIPPED", "direction_id": 3})
+    assert response.status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM requests"), "requests")
+
+
+@pytest.mark.parametrize("q", ["user4242", "1000042", "org 1f0e"])
+def test_admin_search_plan(client, db_engine, statements, q):
+    assert client.get("/api/admin/requests", params={"q": q}).status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM requests"), "requests")
+
+
+def test_my_requests_plan(client, db_engine, statements):
+    assert client.get("/api/webapp/requests").status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM requests"), "requests")
+
+
+def test_webapp_request_history_plan(client, db_engine, statements):
+    assert client.get("/api/webapp/requests/50000").status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM request_history"), "request_history")
+
+
+def test_admin_request_history_plan(client, db_engine, statements):
+    assert client.get("/api/admin/requests/50000").status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM request_history"), "request_history")
+
+
+def test_slot_list_plan(client, db_engine, statements):
+    bump_reference_version("slots")
+    assert client.get("/api/webapp/delivery-slots", params={"direction_id": 3}).status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM delivery_slots"), "delivery_slots")
+
+
+def test_slot_list_with_past_plan(client, db_engine, statements):
+    response = client.get("/api/webapp/delivery-slots", params={"direction_id": 3, "include_past": True})
+    assert response.status_code == 200
+    assert_index_plan(_explain(db_engine, statements, "FROM delivery_slots"), "delivery_slots")
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import text
+
+BULK_IDS = list(range(100000, 100250, 5))
+STATS_BULK_IDS = list(range(150000, 150250, 5))
+
+BUDGETS = [
+    pytest.param("GET", "/api/webapp/requests", {}, 1, id="webapp-requests"),
+    pytest.param("GET", "/api/webapp/requests/50000", {}, 2, id="webapp-request-detail"),
+    pytest.param("GET", "/api/admin/requests", {}, 1, id="admin-requests"),
+    pytest.param("GET", "/api/admin/requests", {"params": {"q": "user42"}}, 1, id="admin-requests-search"),
+    pytest.param("GET", "/api/admin/requests/50000", {}, 2, id="admin-request-detail"),
+    pytest.param("GET", "/api/admin/requests/50000/invoice.pdf", {}, 1, id="admin-invoice"),
+    pytest.param("GET", "/api/admin/clients", {}, 1, id="admin-clients"),
+    pytest.param("GET", "/api/admin/organizations", {}, 1, id="admin-organizations"),
+    pytest.param("GET", "/api/admin/stats", {}, 4, id="admin-stats"),
+    pytest.param(
+        "POST",
+        "/api/webapp/requests",
+        {"json": {"direction_id": 11, "delivery_slot_id": 19990, "boxes_count": 2, "weight_kg": 1.5, "volume_m3": 0.1}},
+        7,
+        id="webapp-create-request",
+    ),
+    pytest.param(
+        "PATCH", "/api/admin/requests/50000", {"json": {"boxes_count": 3, "status": "WAREHOUSE"}}, 5, id="admin-update"
+    ),
+    pytest.param("PATCH", "/api/admin/requests/50000", {"json": {"comment": "checked"}}, 3, id="admin-comment"),
+    pytest.param(
+        "POST", "/api/admin/requests/status", {"json": {"ids": BULK_IDS, "status": "WAREHOUSE"}}, 4, id="admin-bulk"
+    ),
+]
+
+
+@pytest.mark.parametrize("method, path, kwargs, budget", BUDGETS)
+def test_statement_budget(client, statements, method, path, kwargs, budget):
+    response = client.request(method, path, **kwargs)
+    assert response.status_code == 200, response.text
+    assert len(statements) <= budget, "\n\n".join(statement for statement, _ in statements)
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [("/api/webapp/directions", 0), ("/api/webapp/delivery-slots", 0), ("/api/webapp/bootstrap", 1)],
+)
+def test_cached_statement_budget(client, statements, path, budget):
+    assert client.get(path).status_code == 200
+    statements.clear()
+    assert client.get(path).status_code == 200
+    assert len(statements) <= budget, "\n\n".join(statement for statement, _ in statements)
+
+
+def test_request_stats_match_requests(client, db_engine):
+    created = client.post(
+        "/api/webapp/requests",
+        json={"direction_id": 12, "delivery_slot_id": 19980, "boxes_count": 4, "weight_kg": 2.25, "volume_m3": 0.3},
+    )
+    assert created.status_code == 200, created.text
+    updated = client.patch(
+        "/api/admin/requests/70000",
+        json={"delivery_slot_id": 19970, "boxes_count": 6, "weight_kg": 7.5, "status": "WAREHOUSE"},
+    )
+    assert updated.status_code == 200, updated.text
+    bulk = client.post("/api/admin/requests/status", json={"ids": STATS_BULK_IDS, "status": "WAREHOUSE"})
+    assert bulk.status_code == 200, bulk.text
+    assert bulk.json()["updated"] == STATS_BULK_IDS
+
+    with db_engine.connect() as conn:
+        mismatched = conn.execute(
+            text(
+                "WITH expected AS ("
+                " SELECT status::text AS status, direction_id, delivery_slot_id, COUNT(*) AS requests_count,"
+                " SUM(boxes_count) AS boxes_count, SUM(weight_kg) AS weight_kg, SUM(volume_m3) AS volume_m3"
+                " FROM requests GROUP BY 1, 2, 3"
+                "), actual AS ("
+                " SELECT status, direction_id, delivery_slot_id, requests_count::bigint, boxes_count::bigint,"
+                " weight_kg, volume_m3 FROM request_stats WHERE requests_count <> 0"
+                ") "
+                "(SELECT * FROM expected EXCEPT SELECT * FROM actual) "
+                "UNION ALL (SELECT * FROM actual EXCEPT SELECT * FROM expected)"
+            )
+        ).all()
+    assert not mismatched
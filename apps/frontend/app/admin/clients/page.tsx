@@ -12,14 +12,31 @@ type ClientRow = {
   username: string;
   consent_accepted_at: string | null;
   requests_count: number;
+  last_request_at: string | null;
 };
 
 export default function AdminClientsPage() {
   const [rows, setRows] = useState<ClientRow[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [q, setQ] = useState("");
   const [error, setError] = useState("");
 
+  async function load(cursor?: string) {
+    try {
+      setError("");
+      const p = new URLSearchParams();
+      if (q) p.set("q", q);
+      if (cursor) p.set("cursor", cursor);
+      const data = await apiGet(`/api/admin/clients?${p.toString()}`, { credentials: "include" });
+      setRows((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
+    } catch (e) {
+      setError(String(e));
+    }
+  }
+
   useEffect(() => {
-    apiGet("/api/admin/clients", { credentials: "include" }).then(setRows).catch((e) => setError(String(e)));
+    load();
   }, []);
 
   return (
@@ -28,6 +45,12 @@ export default function AdminClientsPage() {
         <h3 style={{ margin: 0 }}>Клиенты</h3>
         <Link href="/admin/requests">Назад к заявкам</Link>
       </div>
+      <div className="card row">
+        <input className="input" style={{ maxWidth: 280 }} placeholder="telegram_id, @username, организация или ИНН" value={q} onChange={(e) => setQ(e.target.value)} />
+        <button className="btn" onClick={() => load()}>
+          Применить
+        </button>
+      </div>
       {error ? <div className="card" style={{ color: "var(--danger)" }}>{error}</div> : null}
       <div className="card">
         <Table>
@@ -37,6 +60,7 @@ export default function AdminClientsPage() {
               <TableHead>@username</TableHead>
               <TableHead>Согласие ПДн</TableHead>
               <TableHead>Заявок</TableHead>
+              <TableHead>Последняя заявка</TableHead>
             </TableRow>
           </TableHeader>
           <TableBody>
@@ -46,10 +70,18 @@ export default function AdminClientsPage() {
                 <TableCell>@{r.username}</TableCell>
                 <TableCell>{r.consent_accepted_at ? new Date(r.consent_accepted_at).toLocaleString() : "-"}</TableCell>
                 <TableCell>{r.requests_count}</TableCell>
+                <TableCell>{r.last_request_at ? new Date(r.last_request_at).toLocaleString() : "-"}</TableCell>
               </TableRow>
             ))}
           </TableBody>
         </Table>
+        {nextCursor ? (
+          <div style={{ textAlign: "center", marginTop: 12 }}>
+            <button className="btn secondary" onClick={() => load(nextCursor)}>
+              Показать еще
+            </button>
+          </div>
+        ) : null}
       </div>
     </div>
   );
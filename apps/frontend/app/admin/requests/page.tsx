@@ -32,20 +32,23 @@ type RequestDetail = {
 
 export default function AdminRequestsPage() {
   const [rows, setRows] = useState<RequestRow[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [q, setQ] = useState("");
   const [status, setStatus] = useState("");
   const [error, setError] = useState("");
   const [open, setOpen] = useState(false);
   const [selected, setSelected] = useState<RequestDetail | null>(null);
 
-  async function load() {
+  async function load(cursor?: string) {
     try {
       setError("");
       const p = new URLSearchParams();
       if (q) p.set("q", q);
       if (status) p.set("status", status);
+      if (cursor) p.set("cursor", cursor);
       const data = await apiGet(`/api/admin/requests?${p.toString()}`, { credentials: "include" });
-      setRows(data);
+      setRows((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
     } catch (e) {
       setError(String(e));
     }
@@ -87,14 +90,14 @@ export default function AdminRequestsPage() {
       </div>
 
       <div className="card row">
-        <input className="input" style={{ maxWidth: 280 }} placeholder="telegram_id или @username" value={q} onChange={(e) => setQ(e.target.value)} />
+        <input className="input" style={{ maxWidth: 280 }} placeholder="Номер, telegram_id, @username, организация или ИНН" value={q} onChange={(e) => setQ(e.target.value)} />
         <select className="select" style={{ maxWidth: 220 }} value={status} onChange={(e) => setStatus(e.target.value)}>
           <option value="">Все статусы</option>
           <option value="OPEN">OPEN</option>
           <option value="IN_PROGRESS">IN_PROGRESS</option>
           <option value="DONE">DONE</option>
         </select>
-        <button className="btn" onClick={load}>
+        <button className="btn" onClick={() => load()}>
           Применить
         </button>
       </div>
@@ -129,6 +132,13 @@ export default function AdminRequestsPage() {
             ))}
           </TableBody>
         </Table>
+        {nextCursor ? (
+          <div style={{ textAlign: "center", marginTop: 12 }}>
+            <button className="btn secondary" onClick={() => load(nextCursor)}>
+              Показать еще
+            </button>
+          </div>
+        ) : null}
       </div>
 
       <Dialog open={open}>
@@ -8,7 +8,7 @@ import { apiGet, apiSend } from "@/lib/api";
 type Client = {
   id: number;
   username: string | null;
-  telegram_id: number;
+  telegram_id?: number;
 };
 
 type Organization = {
@@ -58,9 +58,18 @@ const emptyForm: FormState = {
   contract: "",
 };
 
+const CLIENT_SEARCH_LIMIT = 20;
+const CLIENT_SEARCH_DELAY_MS = 300;
+
+function clientLabel(c: Client) {
+  return `ID ${c.id} / @${c.username || "-"}${c.telegram_id ? ` / ${c.telegram_id}` : ""}`;
+}
+
 export default function OrganizationsPage() {
   const [rows, setRows] = useState<Organization[]>([]);
   const [clients, setClients] = useState<Client[]>([]);
+  const [clientQuery, setClientQuery] = useState("");
+  const [selectedClient, setSelectedClient] = useState<Client | null>(null);
   const [form, setForm] = useState<FormState>(emptyForm);
   const [editingId, setEditingId] = useState<number | null>(null);
   const [error, setError] = useState("");
@@ -68,12 +77,7 @@ export default function OrganizationsPage() {
   async function load() {
     try {
       setError("");
-      const [orgData, clientsData] = await Promise.all([
-        apiGet("/api/admin/organizations", { credentials: "include" }),
-        apiGet("/api/admin/clients", { credentials: "include" }),
-      ]);
-      setRows(orgData);
-      setClients(clientsData);
+      setRows(await apiGet("/api/admin/organizations", { credentials: "include" }));
     } catch (e) {
       setError(String(e));
     }
@@ -83,6 +87,32 @@ export default function OrganizationsPage() {
     load();
   }, []);
 
+  useEffect(() => {
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const p = new URLSearchParams({ limit: String(CLIENT_SEARCH_LIMIT) });
+        if (clientQuery.trim()) p.set("q", clientQuery.trim());
+        const data = await apiGet(`/api/admin/clients?${p.toString()}`, { credentials: "include" });
+        if (!cancelled) setClients(data.items);
+      } catch (e) {
+        if (!cancelled) setError(String(e));
+      }
+    }, CLIENT_SEARCH_DELAY_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [clientQuery]);
+
+  const clientOptions =
+    selectedClient && !clients.some((c) => c.id === selectedClient.id) ? [selectedClient, ...clients] : clients;
+
+  function selectClient(value: string) {
+    setSelectedClient(clientOptions.find((c) => String(c.id) === value) || null);
+    setField("client_id", value);
+  }
+
   function setField<K extends keyof FormState>(key: K, value: FormState[K]) {
     setForm((prev) => ({ ...prev, [key]: value }));
   }
@@ -114,6 +144,7 @@ export default function OrganizationsPage() {
         await apiSend("/api/admin/organizations", "POST", payload, { credentials: "include" });
       }
       setForm(emptyForm);
+      setSelectedClient(null);
       setEditingId(null);
       await load();
     } catch (e) {
@@ -123,6 +154,7 @@ export default function OrganizationsPage() {
 
   function startEdit(row: Organization) {
     setEditingId(row.id);
+    setSelectedClient({ id: row.client_id, username: row.contact_person });
     setForm({
       client_id: String(row.client_id),
       name: row.name || "",
@@ -141,6 +173,7 @@ export default function OrganizationsPage() {
 
   function cancelEdit() {
     setEditingId(null);
+    setSelectedClient(null);
     setForm(emptyForm);
   }
 
@@ -154,11 +187,17 @@ export default function OrganizationsPage() {
         <div className="grid grid-2">
           <div>
             <label>Контактное лицо (клиент)</label>
-            <select className="select" value={form.client_id} onChange={(e) => setField("client_id", e.target.value)}>
+            <input
+              className="input"
+              placeholder="Поиск: telegram_id, @username, организация или ИНН"
+              value={clientQuery}
+              onChange={(e) => setClientQuery(e.target.value)}
+            />
+            <select className="select" value={form.client_id} onChange={(e) => selectClient(e.target.value)}>
               <option value="">Выберите</option>
-              {clients.map((c) => (
+              {clientOptions.map((c) => (
                 <option key={c.id} value={String(c.id)}>
-                  ID {c.id} / @{c.username || "-"} / {c.telegram_id}
+                  {clientLabel(c)}
                 </option>
               ))}
             </select>
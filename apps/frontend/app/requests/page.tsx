@@ -49,25 +49,35 @@ function statusLabel(status: string) {
 
 export default function StaffRequestsPage() {
   const [rows, setRows] = useState<RequestRow[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [q, setQ] = useState("");
   const [status, setStatus] = useState("");
   const [error, setError] = useState("");
   const [open, setOpen] = useState(false);
   const [selected, setSelected] = useState<RequestDetail | null>(null);
 
-  async function load() {
+  async function load(cursor?: string) {
     try {
       setError("");
       const p = new URLSearchParams();
       if (q) p.set("q", q);
       if (status) p.set("status", status);
+      if (cursor) p.set("cursor", cursor);
       const data = await apiGet(`/api/admin/requests?${p.toString()}`, { credentials: "include" });
-      setRows(data);
+      setRows((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
     } catch (e) {
       setError(String(e));
     }
   }
 
+  function exportUrl() {
+    const p = new URLSearchParams();
+    if (q) p.set("q", q);
+    if (status) p.set("status", status);
+    return `${API_URL}/api/admin/requests/export.csv?${p.toString()}`;
+  }
+
   useEffect(() => {
     load();
   }, []);
@@ -123,7 +133,7 @@ export default function StaffRequestsPage() {
     <div className="grid">
       <h3 style={{ margin: 0 }}>Заявки</h3>
       <div className="card row">
-        <input className="input" style={{ maxWidth: 280 }} placeholder="telegram_id или @username" value={q} onChange={(e) => setQ(e.target.value)} />
+        <input className="input" style={{ maxWidth: 280 }} placeholder="Номер, telegram_id, @username, организация или ИНН" value={q} onChange={(e) => setQ(e.target.value)} />
         <select className="select" style={{ maxWidth: 220 }} value={status} onChange={(e) => setStatus(e.target.value)}>
           <option value="">Все статусы</option>
           {statusOptions.map((s) => (
@@ -132,9 +142,12 @@ export default function StaffRequestsPage() {
             </option>
           ))}
         </select>
-        <button className="btn" onClick={load}>
+        <button className="btn" onClick={() => load()}>
           Применить
         </button>
+        <a className="btn secondary" href={exportUrl()}>
+          Экспорт CSV
+        </a>
       </div>
 
       {error ? <div className="card" style={{ color: "var(--danger)" }}>{error}</div> : null}
@@ -177,6 +190,13 @@ export default function StaffRequestsPage() {
             ))}
           </TableBody>
         </Table>
+        {nextCursor ? (
+          <div style={{ textAlign: "center", marginTop: 12 }}>
+            <button className="btn secondary" onClick={() => load(nextCursor)}>
+              Показать еще
+            </button>
+          </div>
+        ) : null}
       </div>
 
       <Dialog open={open}>
@@ -63,16 +63,11 @@ export default function WebAppPage() {
       const tg = (window as any).Telegram?.WebApp;
       tg?.ready?.();
       tg?.expand?.();
-      const [meData, reqData, dirData, slotData] = await Promise.all([
-        apiGet("/api/webapp/me", { headers: getHeaders() }),
-        apiGet("/api/webapp/requests", { headers: getHeaders() }),
-        apiGet("/api/webapp/directions", { headers: getHeaders() }),
-        apiGet("/api/webapp/delivery-slots", { headers: getHeaders() }),
-      ]);
-      setMe(meData);
-      setRows(reqData);
-      setDirections(dirData);
-      setSlots(slotData);
+      const data = await apiGet("/api/webapp/bootstrap", { headers: getHeaders() });
+      setMe(data.me);
+      setRows(data.requests);
+      setDirections(data.directions);
+      setSlots(data.delivery_slots);
     } catch (e) {
       setError(String(e));
     }